@@ -1,44 +1,501 @@
 # algorithms.py
-from collections import deque
+import heapq
+import time
+from array import array
+from collections import OrderedDict, deque
 
-def bfs(start, is_target, grid):
+from maze import as_maze, blocked_indices, open_neighbours, BFS_DIRECTIONS
+
+DFS_DIRECTIONS = [(1,0), (-1,0), (0,1), (0,-1)]
+
+# --- Parent-pointer search core ---
+# Predecessors live in a flat list indexed by y * cols + x, the same layout as
+# Maze.cells, so each frontier entry is just two ints instead of a copy of the
+# path so far. The path is rebuilt once, when the target is found.
+UNSEEN = -2
+NO_PARENT = -1
+
+def reconstruct_path(parent, end_idx, cols):
+    path = []
+    idx = end_idx
+    while idx != NO_PARENT:
+        path.append((idx % cols, idx // cols))
+        idx = parent[idx]
+    path.reverse()
+    return path
+
+def _search(start, is_target, grid, directions, use_queue, blocked):
+    maze = as_maze(grid)
+    cells, rows, cols = maze.cells, maze.height, maze.width
+    blocked = blocked_indices(blocked, cols)
+    parent = [UNSEEN] * (rows * cols)
     visited = set()
-    queue = deque([(start, [])])
 
-    while queue:
-        (x, y), path = queue.popleft()
-        if (x, y) in visited:
+    sx, sy = start
+    frontier = deque([(sy * cols + sx, NO_PARENT)])
+    pop = frontier.popleft if use_queue else frontier.pop
+
+    while frontier:
+        idx, parent_idx = pop()
+        if parent[idx] != UNSEEN:
             continue
+        parent[idx] = parent_idx
+
+        x, y = idx % cols, idx // cols
         visited.add((x, y))
 
         if is_target(x, y):
-            return path + [(x, y)], visited
+            return reconstruct_path(parent, idx, cols), visited
 
-        for dx, dy in [(-1,0),(1,0),(0,-1),(0,1)]:
+        for dx, dy in directions:
             nx, ny = x + dx, y + dy
-            if 0 <= nx < len(grid[0]) and 0 <= ny < len(grid):
-                if grid[ny][nx] != 1 and (nx, ny) not in visited:
-                    # Append new node (nx, ny) to path, not current node (x,y)
-                    queue.append(((nx, ny), path + [(nx, ny)]))
+            if 0 <= nx < cols and 0 <= ny < rows:
+                n_idx = ny * cols + nx
+                if cells[n_idx] != 1 and parent[n_idx] == UNSEEN and n_idx not in blocked:
+                    frontier.append((n_idx, idx))
     return [], visited
 
-def dfs(start, is_target, grid):
+# Both return (path, visited): path runs from start to the target inclusive,
+# visited is the set of expanded cells. blocked is an optional CellOverlay or
+# set of (x, y) treated as walls on top of grid, so callers never need to
+# copy the map just to mark ghosts.
+def bfs(start, is_target, grid, blocked=None):
+    return _search(start, is_target, grid, BFS_DIRECTIONS, True, blocked)
+
+def dfs(start, is_target, grid, blocked=None):
+    return _search(start, is_target, grid, DFS_DIRECTIONS, False, blocked)
+
+# --- Time-sliced searches ---
+# bfs/dfs as a resumable generator, for searches too big for one frame. Each
+# step() expands at most max_nodes cells and/or runs for at most max_seconds,
+# then parks the generator with its frontier intact until the next call.
+# visited grows as it goes, so the search can be drawn while it runs; path is
+# None until the search is over, then the same path bfs/dfs would return.
+# Food eaten and blocked cells that change between steps are seen live.
+class SlicedSearch:
+    def __init__(self, start, is_target, grid, mode="bfs", blocked=None):
+        directions, use_queue = SEARCH_MODES[mode]
+        self.maze = as_maze(grid)
+        self.visited = set()
+        self.path = None
+        self.expanded = 0
+        self.frontier = deque()
+        self._steps = self._run(start, is_target, directions, use_queue, blocked)
+        next(self._steps)
+
+    @property
+    def done(self):
+        return self.path is not None
+
+    def step(self, max_nodes=None, max_seconds=None):
+        # Returns True once the search is over. A budget that allows no work
+        # would never finish, so it is rejected.
+        if max_nodes is not None and max_nodes < 1:
+            raise ValueError(f"max_nodes must be at least 1, got {max_nodes}")
+        if max_seconds is not None and max_seconds <= 0:
+            raise ValueError(f"max_seconds must be positive, got {max_seconds}")
+        if self.path is None:
+            try:
+                self._steps.send((max_nodes, max_seconds))
+            except StopIteration:
+                pass
+        return self.path is not None
+
+    def frontier_cells(self):
+        # Cells queued but not expanded yet
+        cols = self.maze.width
+        return {(idx % cols, idx // cols) for idx, _ in self.frontier
+                if (idx % cols, idx // cols) not in self.visited}
+
+    def _run(self, start, is_target, directions, use_queue, blocked):
+        cells, rows, cols = self.maze.cells, self.maze.height, self.maze.width
+        blocked = blocked_indices(blocked, cols)
+        parent = [UNSEEN] * (rows * cols)
+        visited = self.visited
+        perf_counter = time.perf_counter
+
+        sx, sy = start
+        frontier = self.frontier
+        frontier.append((sy * cols + sx, NO_PARENT))
+        pop = frontier.popleft if use_queue else frontier.pop
+
+        max_nodes, max_seconds = yield
+        nodes_left = max_nodes
+        deadline = perf_counter() + max_seconds if max_seconds is not None else None
+        while frontier:
+            if nodes_left == 0 or (deadline is not None and perf_counter() >= deadline):
+                max_nodes, max_seconds = yield
+                nodes_left = max_nodes
+                deadline = perf_counter() + max_seconds if max_seconds is not None else None
+
+            idx, parent_idx = pop()
+            if parent[idx] != UNSEEN:
+                continue
+            parent[idx] = parent_idx
+            if nodes_left is not None:
+                nodes_left -= 1
+            self.expanded += 1
+
+            x, y = idx % cols, idx // cols
+            visited.add((x, y))
+
+            if is_target(x, y):
+                self.path = reconstruct_path(parent, idx, cols)
+                return
+
+            for dx, dy in directions:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < cols and 0 <= ny < rows:
+                    n_idx = ny * cols + nx
+                    if cells[n_idx] != 1 and parent[n_idx] == UNSEEN and n_idx not in blocked:
+                        frontier.append((n_idx, idx))
+        self.path = []
+
+# --- BFS distance map from ghost positions ---
+def bfs_distance_map(start_pos, maze):
+    maze = as_maze(maze)
+    cells, rows, cols = maze.cells, maze.height, maze.width
+    dist = [[-1]*cols for _ in range(rows)]
+    queue = deque()
+    sx, sy = start_pos
+    dist[sy][sx] = 0
+    queue.append((sx, sy))
+
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy in [(-1,0),(1,0),(0,-1),(0,1)]:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < cols and 0 <= ny < rows:
+                if cells[ny * cols + nx] != 1 and dist[ny][nx] == -1:
+                    dist[ny][nx] = dist[y][x] + 1
+                    queue.append((nx, ny))
+    return dist
+
+# --- Multi-source ghost distance field ---
+# One BFS seeded from every ghost cell at once instead of one BFS per ghost.
+# Results are flat array('i') buffers indexed by y * cols + x; cells no ghost
+# can reach hold UNREACHABLE, which compares larger than any real distance.
+UNREACHABLE = 2**31 - 1
+
+def _multi_source_bfs(sources, maze):
+    maze = as_maze(maze)
+    cells, rows, cols = maze.cells, maze.height, maze.width
+    dist = array('i', [UNREACHABLE]) * (rows * cols)
+    queue = deque()
+
+    for sx, sy in sources:
+        idx = sy * cols + sx
+        if dist[idx] == UNREACHABLE:
+            dist[idx] = 0
+            queue.append(idx)
+
+    while queue:
+        idx = queue.popleft()
+        x, y = idx % cols, idx // cols
+        next_dist = dist[idx] + 1
+        for dx, dy in [(-1,0),(1,0),(0,-1),(0,1)]:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < cols and 0 <= ny < rows:
+                n_idx = ny * cols + nx
+                if cells[n_idx] != 1 and dist[n_idx] == UNREACHABLE:
+                    dist[n_idx] = next_dist
+                    queue.append(n_idx)
+    return dist
+
+def combined_ghost_distance_map(ghost_positions, maze):
+    return _multi_source_bfs(ghost_positions, maze)
+
+# --- Per-maze distance oracle ---
+# Single-source distance rows (flat array('i'), UNREACHABLE where cut off)
+# computed on demand and kept in an LRU bounded in bytes. Rows only depend on
+# walls, which never change within a level, so eating food does not
+# invalidate anything; make a new oracle for a new maze. Whole ghost packs
+# are not cached here: combined_ghost_distance_map covers any number of
+# ghosts in one traversal.
+DEFAULT_CACHE_BYTES = 32 * 1024 * 1024
+
+class DistanceOracle:
+    # capacity is in rows; by default as many as fit in max_bytes
+    def __init__(self, maze, capacity=None, max_bytes=DEFAULT_CACHE_BYTES):
+        self.maze = as_maze(maze)
+        row_bytes = 4 * len(self.maze.cells)
+        self.capacity = capacity if capacity is not None else max(1, max_bytes // row_bytes)
+        self.rows = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def distances_from(self, source):
+        row = self.rows.get(source)
+        if row is not None:
+            self.hits += 1
+            self.rows.move_to_end(source)
+            return row
+
+        self.misses += 1
+        row = self._bfs(source)
+        self.rows[source] = row
+        if len(self.rows) > self.capacity:
+            self.rows.popitem(last=False)
+        return row
+
+    def _bfs(self, source):
+        # Single-source BFS over precomputed neighbour lists; a list doubles
+        # as the queue, since iterating it picks up cells appended on the way
+        maze = self.maze
+        neighbours = open_neighbours(maze)
+        cols = maze.width
+        dist = array('i', [UNREACHABLE]) * len(maze.cells)
+        sx, sy = source
+        start_idx = sy * cols + sx
+        dist[start_idx] = 0
+        queue = [start_idx]
+        for idx in queue:
+            next_dist = dist[idx] + 1
+            for n_idx in neighbours[idx]:
+                if dist[n_idx] == UNREACHABLE:
+                    dist[n_idx] = next_dist
+                    queue.append(n_idx)
+        return dist
+
+    def distance(self, a, b):
+        bx, by = b
+        d = self.distances_from(a)[by * self.maze.width + bx]
+        return -1 if d == UNREACHABLE else d
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "cached_rows": len(self.rows),
+            "capacity": self.capacity,
+        }
+
+# --- Heuristic searches toward a known goal ---
+# Both return (path, visited) like bfs/dfs, with visited holding the expanded
+# cells (jump points for jps). heuristic(a, b) estimates the steps between two
+# (x, y) cells; it must never overestimate, or the path may not be shortest.
+def manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+def astar(start, goal, grid, blocked=None, heuristic=manhattan):
+    maze = as_maze(grid)
+    cells, rows, cols = maze.cells, maze.height, maze.width
+    blocked = blocked_indices(blocked, cols)
+    parent = [UNSEEN] * (rows * cols)
+    best_g = array('i', [UNREACHABLE]) * (rows * cols)
     visited = set()
-    stack = [(start, [])]
 
-    while stack:
-        (x, y), path = stack.pop()
-        if (x, y) in visited:
+    sx, sy = start
+    start_idx = sy * cols + sx
+    goal_idx = goal[1] * cols + goal[0]
+    h = heuristic(start, goal)
+    best_g[start_idx] = 0
+    # Entries are (f, h, idx, parent_idx, g); equal f pops the cell nearer the goal
+    heap = [(h, h, start_idx, NO_PARENT, 0)]
+
+    while heap:
+        _, _, idx, parent_idx, g = heapq.heappop(heap)
+        if parent[idx] != UNSEEN:
             continue
-        visited.add((x, y))
+        parent[idx] = parent_idx
 
-        if is_target(x, y):
-            return path + [(x, y)], visited
+        x, y = idx % cols, idx // cols
+        visited.add((x, y))
+        if idx == goal_idx:
+            return reconstruct_path(parent, idx, cols), visited
 
-        for dx, dy in [(1,0), (-1,0), (0,1), (0,-1)]:
+        next_g = g + 1
+        for dx, dy in BFS_DIRECTIONS:
             nx, ny = x + dx, y + dy
-            if 0 <= nx < len(grid[0]) and 0 <= ny < len(grid):
-                if grid[ny][nx] != 1 and (nx, ny) not in visited:
-                    stack.append(((nx, ny), path + [(nx, ny)]))
+            if 0 <= nx < cols and 0 <= ny < rows:
+                n_idx = ny * cols + nx
+                if (cells[n_idx] != 1 and next_g < best_g[n_idx] and parent[n_idx] == UNSEEN
+                        and n_idx not in blocked):
+                    best_g[n_idx] = next_g
+                    h = heuristic((nx, ny), goal)
+                    heapq.heappush(heap, (next_g + h, h, n_idx, idx, next_g))
+    return [], visited
+
+# Jump point search for 4-connected grids. Among equally short paths it only
+# follows the one that moves horizontally as long as it can, so straight runs
+# are skipped in one jump and only "jump points" go on the heap: cells where
+# the goal is, where a vertical run has a side opening the cell behind it did
+# not have (a forced turn), or from which a vertical jump finds one of those.
+def jps(start, goal, grid, blocked=None, heuristic=manhattan):
+    maze = as_maze(grid)
+    cells, rows, cols = maze.cells, maze.height, maze.width
+    blocked = blocked_indices(blocked, cols)
+
+    def is_open(x, y):
+        if 0 <= x < cols and 0 <= y < rows:
+            idx = y * cols + x
+            return cells[idx] != 1 and idx not in blocked
+        return False
+
+    def forced_side(x, y, dy, side):
+        return is_open(x + side, y) and not is_open(x + side, y - dy)
+
+    def jump_vertical(x, y, dy):
+        while True:
+            y += dy
+            if not is_open(x, y):
+                return None
+            if (x, y) == goal or forced_side(x, y, dy, -1) or forced_side(x, y, dy, 1):
+                return x, y
+
+    def jump_horizontal(x, y, dx):
+        while True:
+            x += dx
+            if not is_open(x, y):
+                return None
+            if (x, y) == goal or jump_vertical(x, y, -1) or jump_vertical(x, y, 1):
+                return x, y
+
+    def successors(x, y, dx, dy):
+        if dx == 0 and dy == 0:
+            # Start: every direction
+            yield jump_horizontal(x, y, -1)
+            yield jump_horizontal(x, y, 1)
+            yield jump_vertical(x, y, -1)
+            yield jump_vertical(x, y, 1)
+        elif dy == 0:
+            yield jump_horizontal(x, y, dx)
+            yield jump_vertical(x, y, -1)
+            yield jump_vertical(x, y, 1)
+        else:
+            yield jump_vertical(x, y, dy)
+            for side in (-1, 1):
+                if forced_side(x, y, dy, side):
+                    yield jump_horizontal(x, y, side)
 
+    parent = {start: None}
+    best_g = {start: 0}
+    closed = set()
+    visited = set()
+    h = heuristic(start, goal)
+    heap = [(h, h, start, 0)]
+
+    while heap:
+        _, _, node, g = heapq.heappop(heap)
+        if node in closed:
+            continue
+        closed.add(node)
+        visited.add(node)
+        if node == goal:
+            return _expand_jumps(parent, node), visited
+
+        x, y = node
+        prev = parent[node]
+        dx = dy = 0
+        if prev is not None:
+            dx = (x > prev[0]) - (x < prev[0])
+            dy = (y > prev[1]) - (y < prev[1])
+        for jump in successors(x, y, dx, dy):
+            if jump is None or jump in closed:
+                continue
+            next_g = g + manhattan(node, jump)
+            if next_g < best_g.get(jump, UNREACHABLE):
+                best_g[jump] = next_g
+                parent[jump] = node
+                h = heuristic(jump, goal)
+                heapq.heappush(heap, (next_g + h, h, jump, next_g))
     return [], visited
+
+def _expand_jumps(parent, node):
+    # Fills in the straight runs between consecutive jump points
+    path = [node]
+    while parent[node] is not None:
+        prev = parent[node]
+        x, y = node
+        dx = (prev[0] > x) - (prev[0] < x)
+        dy = (prev[1] > y) - (prev[1] < y)
+        while (x, y) != prev:
+            x, y = x + dx, y + dy
+            path.append((x, y))
+        node = prev
+    path.reverse()
+    return path
+
+# --- Predictive pathfinding: safest path to food ---
+def is_food_safe(food_pos, ghost_positions):
+    x, y = food_pos
+    neighbors = [(x-2, y), (x+2, y), (x, y-2), (x, y+2)]
+    for gx, gy in ghost_positions:
+        if (gx, gy) in neighbors:
+            return False
+    return True
+
+SEARCH_MODES = {
+    "bfs": (BFS_DIRECTIONS, True),
+    "dfs": (DFS_DIRECTIONS, False),
+}
+
+# Single-pass replacement for "run bfs/dfs once per food, keep the path whose
+# closest approach to a ghost is largest". bfs/dfs never look at the target
+# until a cell is expanded, so the search tree from start is the same whatever
+# food is being searched for. One full traversal therefore yields the exact
+# path every per-food search would return, and the bottleneck (min ghost
+# distance along that path) is carried down the tree as cells are expanded.
+# ghost_dist_map is the flat field returned by combined_ghost_distance_map;
+# blocked works as in bfs/dfs and normally holds the ghost cells. Pass a dict
+# as stats to get the number of cells expanded back in stats["expanded"].
+def safest_food_path(start, grid, ghost_positions, ghost_dist_map, mode="bfs", blocked=None,
+                     food_count=None, stats=None):
+    directions, use_queue = SEARCH_MODES[mode]
+    maze = as_maze(grid)
+    cells, rows, cols = maze.cells, maze.height, maze.width
+    blocked = blocked_indices(blocked, cols)
+    # Cells is_food_safe would reject, built once instead of per food
+    unsafe = {(gx + dx, gy + dy) for gx, gy in ghost_positions
+              for dx, dy in [(-2, 0), (2, 0), (0, -2), (0, 2)]}
+    # With the total food count known, stop as soon as every pellet was seen
+    foods_left = food_count if food_count is not None else -1
+    parent = [UNSEEN] * (rows * cols)
+    # safety[i] = min ghost distance over the cells stepped into on the way to i
+    safety = [UNREACHABLE] * (rows * cols)
+
+    sx, sy = start
+    start_idx = sy * cols + sx
+    frontier = deque([(start_idx, NO_PARENT)])
+    pop = frontier.popleft if use_queue else frontier.pop
+
+    best_idx = -1
+    best_safety_score = -1
+    expanded = 0
+
+    while frontier:
+        idx, parent_idx = pop()
+        if parent[idx] != UNSEEN:
+            continue
+        parent[idx] = parent_idx
+        expanded += 1
+
+        x, y = idx % cols, idx // cols
+        if parent_idx != NO_PARENT:
+            safety[idx] = min(safety[parent_idx], ghost_dist_map[idx])
+
+        if cells[idx] == 2:
+            if (x, y) not in unsafe:
+                score = safety[idx] if idx != start_idx else ghost_dist_map[idx]
+                # Ties go to the first food in row-major order, like the old loop
+                if score > best_safety_score or (score == best_safety_score and idx < best_idx):
+                    best_safety_score = score
+                    best_idx = idx
+            foods_left -= 1
+            if foods_left == 0:
+                break
+
+        for dx, dy in directions:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < cols and 0 <= ny < rows:
+                n_idx = ny * cols + nx
+                if cells[n_idx] != 1 and parent[n_idx] == UNSEEN and n_idx not in blocked:
+                    frontier.append((n_idx, idx))
+
+    if stats is not None:
+        stats["expanded"] = expanded
+    if best_idx == -1:
+        return []
+    return reconstruct_path(parent, best_idx, cols)
@@ -0,0 +1,47 @@
+# benchmarks/bench_corpus.py
+# Getting N mazes by running generate_maze against loading them from a
+# maze_corpus.py file built once from the same seeds: time per maze, bytes
+# per maze on disk against one byte per cell, and that every maze matches.
+#
+#   python -m benchmarks.bench_corpus
+import os
+import tempfile
+import time
+
+from maze_corpus import build_corpus, MazeCorpus
+from maze_generator import generate_maze
+
+CASES = [
+    # rows, cols, mazes
+    (24, 32, 1000),
+    (96, 128, 200),
+    (250, 250, 20),
+]
+SEED = 1234
+
+def main():
+    print(f"{'case':<16} {'generate ms':>12} {'load ms':>9} {'faster':>8} {'bytes/maze':>11} "
+          f"{'raw bytes':>10}  same")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows, cols, count in CASES:
+            path = os.path.join(tmp, f"{rows}x{cols}.pmz")
+            seeds = range(SEED, SEED + count)
+            build_corpus(path, seeds, rows, cols)
+
+            t0 = time.perf_counter()
+            generated = [generate_maze(rows, cols, seed) for seed in seeds]
+            generate_t = (time.perf_counter() - t0) / count
+
+            with MazeCorpus(path) as corpus:
+                t0 = time.perf_counter()
+                loaded = [corpus.load(k) for k in range(len(corpus))]
+                load_t = (time.perf_counter() - t0) / count
+
+            same = loaded == generated
+            name = f"{rows}x{cols}/{count}"
+            print(f"{name:<16} {generate_t * 1000:12.3f} {load_t * 1000:9.3f} "
+                  f"{generate_t / load_t:7.1f}x {os.path.getsize(path) / count:11.0f} "
+                  f"{rows * cols:10}  {'yes' if same else 'NO'}")
+
+if __name__ == "__main__":
+    main()
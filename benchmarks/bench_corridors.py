@@ -0,0 +1,63 @@
+# benchmarks/bench_corridors.py
+# Expanded nodes and time of cell-by-cell bfs against the corridor graph, for
+# a point-to-point query to the far end of the maze and a nearest-food query
+# late in a level, when only a few pellets are left. Path lengths must match:
+# both searches return shortest paths.
+#
+#   python -m benchmarks.bench_corridors
+import random
+import time
+
+from algorithms import bfs
+from benchmarks.suite import far_cell
+from corridors import CorridorGraph
+from maze_generator import generate_maze
+
+SIZES = [(100, 100), (250, 250), (500, 500)]
+FOOD_LEFT = 20
+SEED = 1234
+
+def timed(func, *args):
+    t0 = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - t0
+
+def sparse_food(game_map, start, count, seed=SEED):
+    # Clears all food but `count` pellets, like the end of a level
+    open_cells = [(x, y) for y, row in enumerate(game_map) for x, tile in enumerate(row)
+                  if tile != 1 and (x, y) != start]
+    game_map[start[1]][start[0]] = 0
+    for x, y in open_cells:
+        game_map[y][x] = 0
+    for x, y in random.Random(seed).sample(open_cells, count):
+        game_map[y][x] = 2
+
+def report(name, size, bfs_result, graph_result):
+    (bfs_path, bfs_visited), bfs_t = bfs_result
+    (graph_path, graph_visited), graph_t = graph_result
+    same = len(bfs_path) == len(graph_path)
+    print(f"{name:<8} {size:<10} {len(bfs_visited):>10} {len(graph_visited):>10} "
+          f"{len(bfs_visited) / max(len(graph_visited), 1):7.1f}x {bfs_t * 1000:9.1f} "
+          f"{graph_t * 1000:9.1f}  {'yes' if same else 'NO'}")
+
+def main():
+    print(f"{'query':<8} {'size':<10} {'bfs nodes':>10} {'graph':>10} {'fewer':>8} "
+          f"{'bfs ms':>9} {'graph ms':>9}  same length")
+    for rows, cols in SIZES:
+        size = f"{rows}x{cols}"
+        game_map, start = generate_maze(rows, cols, SEED)
+        sparse_food(game_map, start, FOOD_LEFT)
+        graph, build_t = timed(CorridorGraph, game_map)
+        print(f"{'build':<8} {size:<10} {graph.node_count:>10} nodes, {graph.edge_count} edges, "
+              f"{build_t * 1000:.1f} ms")
+
+        target = far_cell(game_map, start)
+        report("point", size,
+               timed(bfs, start, lambda x, y: (x, y) == target, game_map),
+               timed(graph.shortest_path, start, target))
+        report("food", size,
+               timed(bfs, start, lambda x, y: game_map[y][x] == 2, game_map),
+               timed(graph.nearest_food, start))
+
+if __name__ == "__main__":
+    main()
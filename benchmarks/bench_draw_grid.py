@@ -0,0 +1,93 @@
+# benchmarks/bench_draw_grid.py
+# Per-frame draw time of the full draw_grid repaint against the cached
+# GridRenderer, on a simulated auto-mode run: Pac-Man walks a BFS path,
+# eats the food on it and replans (new visited set) at every cell.
+#
+#   python -m benchmarks.bench_draw_grid
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import time
+
+import pygame
+
+from algorithms import bfs
+from grid import GridRenderer, draw_grid, GRID_SIZE
+from maze_generator import generate_maze
+
+FRAMES_PER_CELL = 8
+MAX_FRAMES = 600
+SIZES = [(24, 32), (48, 64)]
+
+def simulated_frames(game_map, start):
+    # Yields (pacman_pixel_pos, visited, target_food, eaten_cell) once per frame
+    pos = start
+    frame = 0
+    while frame < MAX_FRAMES:
+        path, visited = bfs(pos, lambda x,y: game_map[y][x] == 2, game_map)
+        if len(path) < 2:
+            return
+        target = path[-1]
+        for step in path[1:]:
+            for f in range(FRAMES_PER_CELL):
+                t = (f + 1) / FRAMES_PER_CELL
+                px = (pos[0] + (step[0] - pos[0]) * t) * GRID_SIZE + GRID_SIZE // 2
+                py = (pos[1] + (step[1] - pos[1]) * t) * GRID_SIZE + GRID_SIZE // 2
+                eaten = None
+                if f == FRAMES_PER_CELL - 1:
+                    pos = step
+                    if game_map[pos[1]][pos[0]] == 2:
+                        game_map[pos[1]][pos[0]] = 0
+                        eaten = pos
+                frame += 1
+                yield (int(px), int(py)), visited, target, eaten
+            if eaten:
+                break
+
+def run_full(win, game_map, start):
+    times = []
+    for pac_pos, visited, target, _ in simulated_frames(game_map, start):
+        t0 = time.perf_counter()
+        win.fill((10, 10, 10))
+        draw_grid(win, visited, game_map, target)
+        pygame.draw.circle(win, (255, 255, 0), pac_pos, GRID_SIZE // 2 - 3)
+        pygame.display.update()
+        times.append(time.perf_counter() - t0)
+    return times
+
+def run_cached(win, game_map, start):
+    times = []
+    renderer = GridRenderer(game_map)
+    sprite_rects = []
+    for pac_pos, visited, target, eaten in simulated_frames(game_map, start):
+        t0 = time.perf_counter()
+        if eaten:
+            renderer.mark_dirty(eaten)
+        dirty_rects = renderer.draw(win, visited, target)
+        renderer.restore(win, sprite_rects)
+        dirty_rects.extend(sprite_rects)
+        sprite_rects = [pygame.draw.circle(win, (255, 255, 0), pac_pos, GRID_SIZE // 2 - 3)]
+        dirty_rects.extend(sprite_rects)
+        pygame.display.update(dirty_rects)
+        times.append(time.perf_counter() - t0)
+    return times
+
+def summary(times):
+    times = sorted(times)
+    mean = sum(times) / len(times)
+    return mean * 1000, times[int(len(times) * 0.99)] * 1000
+
+def main():
+    pygame.init()
+    print(f"{'size':<10} {'frames':>7} {'full mean/p99 ms':>18} {'cached mean/p99 ms':>20}")
+    for rows, cols in SIZES:
+        win = pygame.display.set_mode((cols * GRID_SIZE, rows * GRID_SIZE))
+        game_map, start = generate_maze(rows, cols, seed=0)
+        full = run_full(win, game_map.copy(), start)
+        cached = run_cached(win, game_map.copy(), start)
+        size = f"{rows}x{cols}"
+        print(f"{size:<10} {len(full):7d} {'%.3f / %.3f' % summary(full):>18} {'%.3f / %.3f' % summary(cached):>20}")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# benchmarks/bench_ghost_sprites.py
+# Per-frame cost of drawing every ghost with draw_ghost's nine draw calls
+# against one blit of its cached sprite.
+#
+#   python -m benchmarks.bench_ghost_sprites
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import random
+import time
+
+import pygame
+
+from ghost import draw_ghost, blit_ghost, prerender_ghost_sprites, GHOST_COLORS, GHOST_FACINGS
+from grid import GRID_SIZE, ROWS, COLS
+
+GHOST_COUNTS = [5, 50, 500]
+FRAMES = 200
+SEED = 1234
+
+def main():
+    pygame.init()
+    win = pygame.display.set_mode((COLS * GRID_SIZE, ROWS * GRID_SIZE))
+    prerender_ghost_sprites()
+    radius = GRID_SIZE // 2 - 4
+    rng = random.Random(SEED)
+
+    print(f"{'ghosts':>7} {'draw us/frame':>14} {'blit us/frame':>14} {'speedup':>8}")
+    for count in GHOST_COUNTS:
+        ghosts = [(GHOST_COLORS[i % len(GHOST_COLORS)],
+                   rng.uniform(0, COLS * GRID_SIZE), rng.uniform(0, ROWS * GRID_SIZE),
+                   *rng.choice(GHOST_FACINGS)) for i in range(count)]
+
+        t0 = time.perf_counter()
+        for _ in range(FRAMES):
+            for color, x, y, dx, dy in ghosts:
+                draw_ghost(win, color, x, y, radius, dx, dy)
+        draw_t = (time.perf_counter() - t0) / FRAMES
+
+        t0 = time.perf_counter()
+        for _ in range(FRAMES):
+            for color, x, y, dx, dy in ghosts:
+                blit_ghost(win, color, x, y, radius, dx, dy)
+        blit_t = (time.perf_counter() - t0) / FRAMES
+
+        print(f"{count:>7} {draw_t * 1e6:14.1f} {blit_t * 1e6:14.1f} {draw_t / blit_t:7.1f}x")
+
+if __name__ == "__main__":
+    main()
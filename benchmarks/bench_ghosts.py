@@ -0,0 +1,78 @@
+# benchmarks/bench_ghosts.py
+# Per-tick ghost update cost of a list of Ghost objects against one
+# GhostSwarm, wandering and always chasing a Pac-Man that walks to a new cell
+# every N_FRAMES_PER_CELL ticks, for growing ghost counts on the same maze.
+# Also the Pac-Man collision test: a Rect per ghost against the swarm's
+# cell-bucket broad phase.
+#
+#   python -m benchmarks.bench_ghosts
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import random
+import time
+
+from algorithms import bfs, bfs_distance_map
+from ghost import Ghost, GhostSwarm, GHOST_COLORS
+from maze_generator import generate_maze
+from pacman import PacMan
+
+ROWS, COLS = 96, 128
+GHOST_COUNTS = [5, 100, 1000, 5000]
+TICKS = 100
+SEED = 1234
+
+def pacman_walk(game_map, start):
+    # Open cells in bfs order from start, so Pac-Man keeps entering new cells
+    _, visited = bfs(start, lambda x, y: False, game_map)
+    dist = bfs_distance_map(start, game_map)
+    return sorted(visited, key=lambda cell: dist[cell[1]][cell[0]])
+
+def main():
+    game_map, _ = generate_maze(ROWS, COLS, SEED)
+    open_cells = [(x, y) for y, row in enumerate(game_map) for x, tile in enumerate(row) if tile != 1]
+
+    print(f"{'ghosts':>7} {'objects us/tick':>16} {'swarm us/tick':>14} {'speedup':>8} "
+          f"{'chase us/tick':>14} {'rect hit us':>12} {'bucket hit us':>14}")
+    for count in GHOST_COUNTS:
+        random.seed(SEED)
+        positions = [random.choice(open_cells) for _ in range(count)]
+        ghosts = [Ghost(pos, GHOST_COLORS[i % len(GHOST_COLORS)]) for i, pos in enumerate(positions)]
+        swarm = GhostSwarm(positions, GHOST_COLORS)
+
+        t0 = time.perf_counter()
+        for _ in range(TICKS):
+            for ghost in ghosts:
+                ghost.update(game_map)
+        objects_t = (time.perf_counter() - t0) / TICKS
+
+        t0 = time.perf_counter()
+        for _ in range(TICKS):
+            swarm.update(game_map)
+        swarm_t = (time.perf_counter() - t0) / TICKS
+
+        chasers = GhostSwarm(positions, GHOST_COLORS, chase=1.0)
+        pacman_path = pacman_walk(game_map, open_cells[0])
+        t0 = time.perf_counter()
+        for tick in range(TICKS):
+            chasers.update(game_map, pacman_path[tick // GhostSwarm.N_FRAMES_PER_CELL])
+        chase_t = (time.perf_counter() - t0) / TICKS
+
+        pacman = PacMan(pacman_path[0])
+        t0 = time.perf_counter()
+        for _ in range(TICKS):
+            pacman_bb = pacman.get_bounding_box()
+            any(pacman_bb.colliderect(swarm.get_bounding_box(i)) for i in range(len(swarm)))
+        rect_t = (time.perf_counter() - t0) / TICKS
+
+        t0 = time.perf_counter()
+        for _ in range(TICKS):
+            swarm.touches((pacman.grid_x, pacman.grid_y), pacman.pixel_x, pacman.pixel_y,
+                          pacman.radius)
+        bucket_t = (time.perf_counter() - t0) / TICKS
+
+        print(f"{count:>7} {objects_t * 1e6:16.1f} {swarm_t * 1e6:14.1f} {objects_t / swarm_t:7.1f}x "
+              f"{chase_t * 1e6:14.1f} {rect_t * 1e6:12.1f} {bucket_t * 1e6:14.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/bench_replanning.py
+# Per-step planning cost of a fresh bfs against the incremental D* Lite
+# planner, over a scripted walk: Pac-Man follows the plan one cell per step,
+# eats what it reaches and ghosts wander at random, then both replan. Path
+# lengths must match at every step: both find the nearest food.
+#
+#   python -m benchmarks.bench_replanning
+import random
+import time
+
+from algorithms import bfs
+from dstar_lite import DStarLite
+from maze import CellOverlay
+from maze_generator import generate_maze
+
+CASES = [
+    # rows, cols, food left, ghosts
+    (24, 32, None, 5),
+    (100, 100, 200, 10),
+    (250, 250, 200, 20),
+]
+STEPS = 300
+SEED = 1234
+
+def setup(rows, cols, food_left, num_ghosts, seed=SEED):
+    rng = random.Random(seed)
+    game_map, start = generate_maze(rows, cols, seed)
+    game_map[start[1]][start[0]] = 0
+    open_cells = [(x, y) for y, row in enumerate(game_map) for x, tile in enumerate(row)
+                  if tile != 1 and (x, y) != start]
+    if food_left is not None:
+        # Late in a level: only a few pellets left
+        for x, y in open_cells:
+            game_map[y][x] = 0
+        for x, y in rng.sample(open_cells, food_left):
+            game_map[y][x] = 2
+    ghosts = rng.sample(open_cells, num_ghosts)
+    return game_map, start, ghosts, rng
+
+def wander(game_map, ghosts, overlay, pacman, rng):
+    rows, cols = len(game_map), len(game_map[0])
+    for i, (gx, gy) in enumerate(ghosts):
+        moves = [(gx + dx, gy + dy) for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]
+                 if 0 <= gx + dx < cols and 0 <= gy + dy < rows
+                 and game_map[gy + dy][gx + dx] != 1 and (gx + dx, gy + dy) != pacman]
+        if moves and rng.random() < 0.5:
+            new_pos = rng.choice(moves)
+            overlay.move((gx, gy), new_pos)
+            ghosts[i] = new_pos
+
+def main():
+    print(f"{'case':<26} {'bfs cells':>10} {'d* cells':>9} {'bfs us':>8} {'d* us':>8}  same length")
+    for rows, cols, food_left, num_ghosts in CASES:
+        game_map, pos, ghosts, rng = setup(rows, cols, food_left, num_ghosts)
+        overlay = CellOverlay(cols, ghosts)
+        planner = DStarLite(game_map, overlay)
+        planner.plan(pos)       # initial full search, not counted
+
+        bfs_cells = dstar_cells = 0
+        bfs_t = dstar_t = 0.0
+        same = True
+        for _ in range(STEPS):
+            wander(game_map, ghosts, overlay, pos, rng)
+            t0 = time.perf_counter()
+            bfs_path, bfs_visited = bfs(pos, lambda x, y: game_map[y][x] == 2, game_map, overlay)
+            t1 = time.perf_counter()
+            path, visited = planner.plan(pos)
+            t2 = time.perf_counter()
+            bfs_t += t1 - t0
+            dstar_t += t2 - t1
+            bfs_cells += len(bfs_visited)
+            dstar_cells += len(visited)
+            same = same and len(bfs_path) == len(path)
+
+            if len(path) > 1:
+                pos = path[1]
+            if path and game_map[pos[1]][pos[0]] == 2:
+                game_map[pos[1]][pos[0]] = 0
+                planner.eat(*pos)
+
+        food = "all food" if food_left is None else f"{food_left} food"
+        name = f"{rows}x{cols}/{food}/{num_ghosts}g"
+        print(f"{name:<26} {bfs_cells / STEPS:10.1f} {dstar_cells / STEPS:9.1f} "
+              f"{bfs_t / STEPS * 1e6:8.1f} {dstar_t / STEPS * 1e6:8.1f}  {'yes' if same else 'NO'}")
+
+if __name__ == "__main__":
+    main()
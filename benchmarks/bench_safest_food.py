@@ -0,0 +1,77 @@
+# benchmarks/bench_safest_food.py
+# Compares the single-pass safest_food_path planner against the old
+# "one bfs/dfs per food pellet" loop it replaced.
+#
+#   python -m benchmarks.bench_safest_food
+import copy
+import random
+import time
+
+from algorithms import bfs, dfs, combined_ghost_distance_map, is_food_safe, safest_food_path
+from maze_generator import generate_maze
+
+SIZES = [(24, 32), (48, 64), (72, 96)]
+NUM_GHOSTS = 5
+SEEDS = range(3)
+
+# The pre-planner implementation, kept here as the reference answer
+def per_food_safest_path(start, grid, ghost_positions, ghost_dist_map, mode="bfs"):
+    algo_func = bfs if mode == "bfs" else dfs
+    rows, cols = len(grid), len(grid[0])
+    food_positions = [(x, y) for y in range(rows) for x in range(cols) if grid[y][x] == 2]
+
+    best_path = []
+    best_safety_score = -1
+    for food_pos in food_positions:
+        if not is_food_safe(food_pos, ghost_positions):
+            continue
+        path, _ = algo_func(start, lambda x,y: (x,y) == food_pos, grid)
+        if not path:
+            continue
+        safety_score = min(ghost_dist_map[y * cols + x] for x,y in path[1:] or path)
+        if safety_score > best_safety_score:
+            best_safety_score = safety_score
+            best_path = path
+    return best_path
+
+def make_case(rows, cols, seed):
+    random.seed(seed)
+    game_map, start = generate_maze(rows, cols, seed)
+    start_x, start_y = start
+    if game_map[start_y][start_x] == 2:
+        game_map[start_y][start_x] = 0
+    open_cells = [(x, y) for y in range(rows) for x in range(cols)
+                  if game_map[y][x] != 1 and (x, y) != start]
+    ghost_positions = random.sample(open_cells, NUM_GHOSTS)
+
+    map_with_ghosts = copy.deepcopy(game_map)
+    for gx, gy in ghost_positions:
+        map_with_ghosts[gy][gx] = 1
+    ghost_dist_map = combined_ghost_distance_map(ghost_positions, game_map)
+    return start, map_with_ghosts, ghost_positions, ghost_dist_map
+
+def timed(func, *args):
+    t0 = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - t0
+
+def main():
+    print(f"{'size':<10} {'mode':>4} {'per-food ms':>12} {'single ms':>10} {'speedup':>8}  same")
+    for rows, cols in SIZES:
+        for mode in ["bfs", "dfs"]:
+            old_total = new_total = 0.0
+            same = True
+            for seed in SEEDS:
+                case = make_case(rows, cols, seed)
+                old_path, old_t = timed(per_food_safest_path, *case, mode)
+                new_path, new_t = timed(safest_food_path, *case, mode)
+                old_total += old_t
+                new_total += new_t
+                same = same and old_path == new_path
+            n = len(SEEDS)
+            size = f"{rows}x{cols}"
+            print(f"{size:<10} {mode:>4} {old_total / n * 1000:12.2f} {new_total / n * 1000:10.2f}"
+                  f" {old_total / new_total:7.1f}x  {'yes' if same else 'NO'}")
+
+if __name__ == "__main__":
+    main()
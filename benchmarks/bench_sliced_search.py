@@ -0,0 +1,52 @@
+# benchmarks/bench_sliced_search.py
+# A whole bfs/dfs in one call against the same search as a SlicedSearch,
+# resumed with a cell budget and with a time budget per call: the worst
+# single call is what a frame has to absorb. Paths must match bfs/dfs.
+#
+#   python -m benchmarks.bench_sliced_search
+import time
+
+from algorithms import bfs, dfs, SlicedSearch
+from benchmarks.suite import far_cell
+from maze_generator import generate_maze
+
+SIZES = [(100, 100), (250, 250), (500, 500)]
+NODE_BUDGET = 2000
+TIME_BUDGET = 0.002     # seconds
+SEED = 1234
+
+def sliced(start, is_target, game_map, mode, **budget):
+    search = SlicedSearch(start, is_target, game_map, mode)
+    calls = 0
+    worst = 0.0
+    done = False
+    while not done:
+        t0 = time.perf_counter()
+        done = search.step(**budget)
+        worst = max(worst, time.perf_counter() - t0)
+        calls += 1
+    return search.path, calls, worst
+
+def main():
+    print(f"{'case':<14} {'whole ms':>9} {'cells':>7} | {'calls':>6} {'worst ms':>9} | "
+          f"{'calls':>6} {'worst ms':>9}  same path")
+    for rows, cols in SIZES:
+        game_map, start = generate_maze(rows, cols, SEED)
+        target = far_cell(game_map, start)
+        is_target = lambda x, y: (x, y) == target
+        for mode, search in (("bfs", bfs), ("dfs", dfs)):
+            t0 = time.perf_counter()
+            path, visited = search(start, is_target, game_map)
+            whole_t = time.perf_counter() - t0
+            node_path, node_calls, node_worst = sliced(start, is_target, game_map, mode,
+                                                       max_nodes=NODE_BUDGET)
+            time_path, time_calls, time_worst = sliced(start, is_target, game_map, mode,
+                                                       max_seconds=TIME_BUDGET)
+            same = path == node_path == time_path
+            name = f"{rows}x{cols}/{mode}"
+            print(f"{name:<14} {whole_t * 1000:9.1f} {len(visited):7} | {node_calls:6} "
+                  f"{node_worst * 1000:9.2f} | {time_calls:6} {time_worst * 1000:9.2f}  "
+                  f"{'yes' if same else 'NO'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+# benchmarks/suite.py
+# Time and peak memory of the pathfinding, maze and rendering hot paths on
+# seeded mazes, from the game's 24x32 board up to 1000x1000.
+#
+#   python -m benchmarks.suite                          # default sizes
+#   python -m benchmarks.suite --sizes 24x32 1000x1000
+#   python -m benchmarks.suite --save benchmarks/baseline.json
+#   python -m benchmarks.suite --compare benchmarks/baseline.json
+#
+# --compare exits with status 1 when any case is slower (or uses more peak
+# memory) than the baseline by more than --tolerance.
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from functools import partial
+
+import pygame
+
+from algorithms import (bfs, dfs, astar, jps, bfs_distance_map, combined_ghost_distance_map,
+                        safest_food_path)
+from corridors import CorridorGraph
+from grid import draw_grid, GRID_SIZE
+from maze_generator import generate_maze
+
+DEFAULT_SIZES = ["24x32", "96x128", "250x250", "1000x1000"]
+GHOST_COUNTS = [5, 50]
+FOOD_DENSITIES = [0.1, 0.3]       # chance an open cell holds food
+MAX_DRAW_CELLS = 256 * 256        # draw_grid needs a GRID_SIZE px surface per cell
+SEED = 1234
+
+def parse_size(text):
+    rows, cols = text.lower().split("x")
+    return int(rows), int(cols)
+
+# --- Fixtures ---
+def make_maze(rows, cols, food_density, seed=SEED):
+    game_map, start = seeded_maze(rows, cols, seed)
+    # Re-sprinkle food so the density is a benchmark parameter
+    rng = random.Random(seed)
+    for y in range(rows):
+        row = game_map[y]
+        for x in range(cols):
+            if row[x] != 1:
+                row[x] = 2 if rng.random() < food_density else 0
+    game_map[start[1]][start[0]] = 0
+    return game_map, start
+
+def seeded_maze(rows, cols, seed=SEED):
+    return generate_maze(rows, cols, seed)
+
+def place_ghosts(game_map, start, num_ghosts, seed=SEED):
+    open_cells = [(x, y) for y, row in enumerate(game_map) for x, tile in enumerate(row)
+                  if tile != 1 and (x, y) != start]
+    return random.Random(seed).sample(open_cells, min(num_ghosts, len(open_cells)))
+
+def far_cell(game_map, start):
+    # The reachable cell furthest from start, so bfs/dfs cover most of the maze
+    dist = bfs_distance_map(start, game_map)
+    cols = len(game_map[0])
+    best = max(range(len(dist) * cols), key=lambda i: dist[i // cols][i % cols])
+    return best % cols, best // cols
+
+def plan_safest_food(game_map, start, ghost_positions):
+    # Mirrors GameSession.find_safest_food_path
+    ghost_dist_map = combined_ghost_distance_map(ghost_positions, game_map)
+    return safest_food_path(start, game_map, ghost_positions, ghost_dist_map, "bfs",
+                            blocked=ghost_positions)
+
+class Fixtures:
+    # The mazes, corridor graphs and ghosts for one size, each built the first
+    # time a selected case asks for it and shared with the other cases
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.built = {}
+
+    def get(self, key, build):
+        if key not in self.built:
+            self.built[key] = build()
+        return self.built[key]
+
+    def maze(self, food_density):
+        # (game_map, start, target)
+        def build():
+            game_map, start = make_maze(self.rows, self.cols, food_density)
+            return game_map, start, far_cell(game_map, start)
+        return self.get(("maze", food_density), build)
+
+    def graph(self, food_density):
+        return self.get(("graph", food_density), lambda: CorridorGraph(self.maze(food_density)[0]))
+
+    def ghosts(self, food_density, num_ghosts):
+        game_map, start, _ = self.maze(food_density)
+        return self.get(("ghosts", food_density, num_ghosts),
+                        lambda: place_ghosts(game_map, start, num_ghosts))
+
+# --- Cases ---
+# Each setup builds what its case needs from the size's Fixtures and returns
+# the callable to time.
+def setup_generate_maze(fx):
+    return lambda: seeded_maze(fx.rows, fx.cols)
+
+def setup_search(fx, func, food_density):
+    game_map, start, target = fx.maze(food_density)
+    if func in (bfs, dfs):
+        is_target = lambda x, y: (x, y) == target
+        return lambda: func(start, is_target, game_map)
+    return lambda: func(start, target, game_map)
+
+def setup_distance_map(fx):
+    # Walls are the same for every food density
+    game_map, start, _ = fx.maze(FOOD_DENSITIES[0])
+    return lambda: bfs_distance_map(start, game_map)
+
+def setup_corridor_graph(fx):
+    game_map = fx.maze(FOOD_DENSITIES[0])[0]
+    return lambda: CorridorGraph(game_map)
+
+def setup_corridor_path(fx, food_density):
+    _, start, target = fx.maze(food_density)
+    graph = fx.graph(food_density)
+    return lambda: graph.shortest_path(start, target)
+
+def setup_corridor_food(fx, food_density):
+    start = fx.maze(food_density)[1]
+    graph = fx.graph(food_density)
+    return lambda: graph.nearest_food(start)
+
+def setup_ghost_field(fx, num_ghosts):
+    game_map = fx.maze(FOOD_DENSITIES[0])[0]
+    ghosts = fx.ghosts(FOOD_DENSITIES[0], num_ghosts)
+    return lambda: combined_ghost_distance_map(ghosts, game_map)
+
+def setup_safest_food(fx, food_density, num_ghosts):
+    game_map, start, _ = fx.maze(food_density)
+    ghosts = fx.ghosts(food_density, num_ghosts)
+    return lambda: plan_safest_food(game_map, start, ghosts)
+
+def setup_draw_grid(fx, food_density):
+    game_map, start, target = fx.maze(food_density)
+    surface = pygame.Surface((fx.cols * GRID_SIZE, fx.rows * GRID_SIZE))
+    visited = bfs(start, lambda x, y: (x, y) == target, game_map)[1]
+    return lambda: draw_grid(surface, visited, game_map, target)
+
+def build_cases(sizes):
+    # Yields (name, setup) pairs in run order. Nothing is built until setup()
+    # is called, so the cases --filter skips cost nothing.
+    for rows, cols in sizes:
+        fx = Fixtures(rows, cols)
+        size = f"{rows}x{cols}"
+        yield f"generate_maze/{size}", partial(setup_generate_maze, fx)
+
+        for food_density in FOOD_DENSITIES:
+            tag = f"{size}/food={food_density}"
+            for func in (bfs, dfs, astar, jps):
+                yield f"{func.__name__}/{tag}", partial(setup_search, fx, func, food_density)
+            if food_density == FOOD_DENSITIES[0]:
+                yield f"bfs_distance_map/{size}", partial(setup_distance_map, fx)
+                yield f"corridor_graph/{size}", partial(setup_corridor_graph, fx)
+            yield f"corridor_path/{tag}", partial(setup_corridor_path, fx, food_density)
+            yield f"corridor_food/{tag}", partial(setup_corridor_food, fx, food_density)
+
+            for num_ghosts in GHOST_COUNTS:
+                if food_density == FOOD_DENSITIES[0]:
+                    yield (f"combined_ghost_distance_map/{size}/ghosts={num_ghosts}",
+                           partial(setup_ghost_field, fx, num_ghosts))
+                yield (f"find_safest_food_path/{tag}/ghosts={num_ghosts}",
+                       partial(setup_safest_food, fx, food_density, num_ghosts))
+
+            if rows * cols <= MAX_DRAW_CELLS:
+                yield f"draw_grid/{tag}", partial(setup_draw_grid, fx, food_density)
+
+# --- Measurement ---
+def measure(func, min_seconds=0.2, max_repeats=20):
+    # Best-of-N wall time, then one extra run under tracemalloc for peak memory
+    times = []
+    started = time.perf_counter()
+    while len(times) < max_repeats and (not times or time.perf_counter() - started < min_seconds):
+        t0 = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": min(times), "repeats": len(times), "peak_kb": peak / 1024}
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for key in ("seconds", "peak_kb"):
+            if base[key] > 0 and result[key] > base[key] * (1 + tolerance):
+                regressions.append((name, key, base[key], result[key]))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot-path benchmark suite")
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES, help="ROWSxCOLS, e.g. 1000x1000")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--save", help="write results as JSON (e.g. a new baseline)")
+    parser.add_argument("--compare", help="baseline JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    args = parser.parse_args()
+
+    pygame.init()
+    results = {}
+    print(f"{'case':<62} {'ms':>10} {'peak KB':>10} {'runs':>5}")
+    for name, setup in build_cases([parse_size(s) for s in args.sizes]):
+        if args.filter not in name:
+            continue
+        result = measure(setup())
+        results[name] = result
+        print(f"{name:<62} {result['seconds'] * 1000:10.2f} {result['peak_kb']:10.1f} {result['repeats']:5d}")
+        sys.stdout.flush()
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Saved {len(results)} results to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for name, key, before, after in regressions:
+            print(f"REGRESSION {name} {key}: {before:.4g} -> {after:.4g}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.compare} (tolerance {args.tolerance:.0%})")
+
+if __name__ == "__main__":
+    main()
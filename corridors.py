@@ -0,0 +1,243 @@
+# corridors.py
+# Corridor graph: the maze compressed to its junctions and dead ends.
+#
+# Every open cell with other than two open neighbours becomes a node; the runs
+# of two-neighbour cells between nodes become weighted edges. Searches then
+# step from junction to junction instead of cell by cell, and only walk a
+# corridor's cells when it holds something they care about (food, the goal or
+# a ghost). Paths come back as plain cell lists, like bfs/dfs.
+import heapq
+from array import array
+
+from maze import as_maze, blocked_indices, open_neighbours
+
+START = -1      # "node" id of a start cell that sits inside a corridor
+
+class CorridorGraph:
+    def __init__(self, maze):
+        maze = as_maze(maze)
+        self.maze = maze
+        cells = maze.cells
+        size = len(cells)
+
+        # Open neighbours of each cell, as flat indexes
+        neighbours = self.neighbours = open_neighbours(maze)
+
+        self.node_cells = []                   # node id -> flat index
+        self.node_id = array('i', [-1]) * size
+        # Edges: end nodes, interior cells ordered from a to b, length
+        # (interior cells + 1) and how many interior cells hold food
+        self.edge_a = []
+        self.edge_b = []
+        self.edge_cells = []
+        self.edge_length = []
+        self.edge_food = []
+        # adjacency[node] = [(edge, forward)], forward meaning a -> b; a corridor
+        # looping back to its own node is listed once in each direction
+        self.adjacency = []
+        # Where each corridor cell lives: edge id and position in edge_cells
+        self.cell_edge = array('i', [-1]) * size
+        self.cell_offset = array('i', [0]) * size
+
+        for idx in range(size):
+            if cells[idx] != 1 and len(neighbours[idx]) != 2:
+                self._add_node(idx)
+        for node in range(len(self.node_cells)):
+            self._trace_edges(node)
+        # A ring of corridor cells with no junction on it needs one cell
+        # promoted to a node before it can be traced
+        for idx in range(size):
+            if cells[idx] != 1 and self.node_id[idx] == -1 and self.cell_edge[idx] == -1:
+                self._trace_edges(self._add_node(idx))
+
+    def _add_node(self, idx):
+        node = len(self.node_cells)
+        self.node_cells.append(idx)
+        self.node_id[idx] = node
+        self.adjacency.append([])
+        return node
+
+    def _trace_edges(self, node):
+        node_idx = self.node_cells[node]
+        cells = self.maze.cells
+        for first in self.neighbours[node_idx]:
+            if self.cell_edge[first] != -1:
+                continue        # corridor already traced from its other end
+            if self.node_id[first] != -1 and first < node_idx:
+                continue        # direct node-to-node step, added once
+            interior = []
+            prev, cur = node_idx, first
+            while self.node_id[cur] == -1:
+                interior.append(cur)
+                a, b = self.neighbours[cur]
+                prev, cur = cur, (b if a == prev else a)
+            edge = len(self.edge_a)
+            other = self.node_id[cur]
+            self.edge_a.append(node)
+            self.edge_b.append(other)
+            self.edge_cells.append(interior)
+            self.edge_length.append(len(interior) + 1)
+            self.edge_food.append(sum(1 for i in interior if cells[i] == 2))
+            for offset, i in enumerate(interior):
+                self.cell_edge[i] = edge
+                self.cell_offset[i] = offset
+            self.adjacency[node].append((edge, True))
+            self.adjacency[other].append((edge, False))
+
+    # --- Stats ---
+    @property
+    def node_count(self):
+        return len(self.node_cells)
+
+    @property
+    def edge_count(self):
+        return len(self.edge_a)
+
+    # --- Food bookkeeping ---
+    def eat(self, x, y):
+        # Call after the food at (x, y) has been cleared from the maze
+        edge = self.cell_edge[y * self.maze.width + x]
+        if edge != -1:
+            self.edge_food[edge] -= 1
+
+    # --- Queries ---
+    # Both return (path, visited) like bfs/dfs: path runs from start to the
+    # target inclusive ([] if none is reachable), visited holds the junction
+    # and dead-end cells that were expanded. blocked is a CellOverlay or a set
+    # of (x, y), treated as walls.
+    def shortest_path(self, start, goal, blocked=None):
+        cols = self.maze.width
+        goal_idx = goal[1] * cols + goal[0]
+        goal_edge = self.cell_edge[goal_idx]
+        gx, gy = goal
+        # Manhattan distance to the goal: never more than the real distance
+        heuristic = lambda idx: abs(idx % cols - gx) + abs(idx // cols - gy)
+        return self._search(start, lambda idx: idx == goal_idx,
+                            lambda edge: edge == goal_edge, heuristic, blocked)
+
+    def nearest_food(self, start, blocked=None):
+        cells, edge_food = self.maze.cells, self.edge_food
+        return self._search(start, lambda idx: cells[idx] == 2,
+                            lambda edge: edge_food[edge] > 0, None, blocked)
+
+    def _search(self, start, is_target, edge_has_target, heuristic, blocked):
+        cols = self.maze.width
+        blocked = blocked_indices(blocked, cols)
+        node_id, cell_edge = self.node_id, self.cell_edge
+        node_cells, adjacency = self.node_cells, self.adjacency
+        edge_a, edge_b, edge_length = self.edge_a, self.edge_b, self.edge_length
+
+        sx, sy = start
+        start_idx = sy * cols + sx
+        # A ghost on the cell Pac-Man is leaving does not trap it, as in bfs
+        if start_idx in blocked:
+            blocked = set(blocked)
+            blocked.discard(start_idx)
+        # Corridors with a blocked cell on them get walked cell by cell
+        blocked_edges = {cell_edge[idx] for idx in blocked if cell_edge[idx] != -1}
+
+        # best = (distance, from node, edge, target cell)
+        best = None
+        dist = {}
+        parent = {}
+        heap = []
+        visited = set()
+
+        def push(node, d, via):
+            if node_cells[node] in blocked or dist.get(node, d + 1) <= d:
+                return
+            dist[node] = d
+            parent[node] = via
+            h = heuristic(node_cells[node]) if heuristic else 0
+            heapq.heappush(heap, (d + h, d, node))
+
+        if is_target(start_idx):
+            return [start], visited
+
+        if node_id[start_idx] != -1:
+            push(node_id[start_idx], 0, None)
+        else:
+            # Walk out of the start corridor both ways, as two half edges
+            edge = cell_edge[start_idx]
+            offset = self.cell_offset[start_idx]
+            interior = self.edge_cells[edge]
+            for forward in (True, False):
+                steps = interior[offset + 1:] if forward else interior[offset - 1::-1] if offset else []
+                end_node = edge_b[edge] if forward else edge_a[edge]
+                d = 0
+                for idx in steps:
+                    d += 1
+                    if idx in blocked:
+                        break
+                    if is_target(idx) and (best is None or d < best[0]):
+                        best = (d, START, (edge, forward), idx)
+                        break
+                else:
+                    push(end_node, d + 1, (START, edge, forward))
+
+        while heap:
+            f, d, node = heapq.heappop(heap)
+            if best is not None and f >= best[0]:
+                break
+            if d > dist[node]:
+                continue
+            node_idx = node_cells[node]
+            visited.add((node_idx % cols, node_idx // cols))
+            if is_target(node_idx):
+                best = (d, node, None, node_idx)
+                break
+
+            for edge, forward in adjacency[node]:
+                other = edge_b[edge] if forward else edge_a[edge]
+                if edge in blocked_edges or edge_has_target(edge):
+                    interior = self.edge_cells[edge]
+                    steps = interior if forward else reversed(interior)
+                    step_d = d
+                    for idx in steps:
+                        step_d += 1
+                        if idx in blocked:
+                            break
+                        if is_target(idx):
+                            if best is None or step_d < best[0]:
+                                best = (step_d, node, (edge, forward), idx)
+                            break
+                    else:
+                        push(other, d + edge_length[edge], (node, edge, forward))
+                else:
+                    push(other, d + edge_length[edge], (node, edge, forward))
+
+        if best is None:
+            return [], visited
+        return self._build_path(start_idx, best, parent), visited
+
+    def _build_path(self, start_idx, best, parent):
+        _, node, last_leg, target_idx = best
+        # Legs are (from node, edge, forward), collected target-first
+        legs = []
+        if last_leg is not None:
+            legs.append((node,) + last_leg)
+        while node != START:
+            via = parent[node]
+            if via is None:
+                break
+            legs.append(via)
+            node = via[0]
+        legs.reverse()
+
+        path = [start_idx]
+        for from_node, edge, forward in legs:
+            interior = self.edge_cells[edge]
+            if from_node == START:
+                offset = self.cell_offset[start_idx]
+                steps = interior[offset + 1:] if forward else interior[offset - 1::-1] if offset else []
+            else:
+                steps = interior if forward else interior[::-1]
+            for idx in steps:
+                path.append(idx)
+                if idx == target_idx:
+                    break
+            else:
+                path.append(self.node_cells[self.edge_b[edge] if forward else self.edge_a[edge]])
+
+        cols = self.maze.width
+        return [(idx % cols, idx // cols) for idx in path]
@@ -0,0 +1,169 @@
+# dstar_lite.py
+# Incremental nearest-food planner (D* Lite) for the continuous auto mode.
+#
+# The search runs backwards from every food cell towards Pac-Man and keeps its
+# g / rhs values between plans. Before each plan only the cells whose state
+# changed (a ghost arrived or left, a pellet was eaten) and their neighbours
+# are re-queued, so a replan costs roughly the size of the change instead of a
+# whole new search. Pac-Man moving is absorbed by the km offset on the keys.
+import heapq
+from array import array
+
+from algorithms import UNREACHABLE
+from maze import as_maze, blocked_indices, open_neighbours
+
+INF = UNREACHABLE
+# With more changed cells than this between two plans, start over instead
+RESET_CHANGES = 64
+
+class DStarLite:
+    # blocked is the CellOverlay (or set of (x, y)) of extra walls; it is read,
+    # not copied, at every plan, so the caller just keeps it up to date
+    def __init__(self, maze, blocked=None):
+        maze = as_maze(maze)
+        self.maze = maze
+        self.blocked_source = blocked
+        self.neighbours = open_neighbours(maze)
+        self.changed = set()
+        self.needs_reset = True
+        self.resets = 0
+        self.expanded = 0
+
+    def eat(self, x, y):
+        # Call after the food at (x, y) has been cleared from the maze
+        self.changed.add(y * self.maze.width + x)
+
+    def plan(self, start):
+        # Returns (path, visited) like bfs: the shortest path from start to the
+        # nearest reachable food, and the cells this repair expanded
+        cols = self.maze.width
+        start_idx = start[1] * cols + start[0]
+        blocked = set(blocked_indices(self.blocked_source, cols))
+        # A ghost on the cell Pac-Man is leaving does not trap it, as in bfs
+        blocked.discard(start_idx)
+
+        if not self.needs_reset:
+            changed = self.changed | (blocked ^ self.blocked)
+            if len(changed) > RESET_CHANGES:
+                self.needs_reset = True
+        self.changed = set()
+        self.blocked = blocked
+
+        if self.needs_reset:
+            self._reset(start_idx)
+        else:
+            if start_idx != self.last_start:
+                self.km += self._h(self.last_start, start_idx)
+                self.last_start = start_idx
+            for idx in changed:
+                self._update(idx)
+                for n_idx in self.neighbours[idx]:
+                    self._update(n_idx)
+
+        self.visited = set()
+        self._compute(start_idx)
+        self.expanded += len(self.visited)
+        return self._extract(start_idx), {(idx % cols, idx // cols) for idx in self.visited}
+
+    # --- Search state ---
+    def _reset(self, start_idx):
+        cells = self.maze.cells
+        size = len(cells)
+        self.g = array('i', [INF]) * size
+        self.rhs = array('i', [INF]) * size
+        self.queue = []
+        self.queued = {}
+        self.km = 0
+        self.last_start = start_idx
+        for idx in range(size):
+            if cells[idx] == 2 and idx not in self.blocked:
+                self.rhs[idx] = 0
+                self._push(idx, start_idx)
+        self.needs_reset = False
+        self.resets += 1
+
+    def _h(self, a, b):
+        # Manhattan distance between two flat indexes
+        cols = self.maze.width
+        return abs(a % cols - b % cols) + abs(a // cols - b // cols)
+
+    def _key(self, idx, start_idx):
+        g, rhs = self.g[idx], self.rhs[idx]
+        best = g if g < rhs else rhs
+        return best + self._h(start_idx, idx) + self.km, best
+
+    def _push(self, idx, start_idx):
+        key = self._key(idx, start_idx)
+        self.queued[idx] = key
+        heapq.heappush(self.queue, (key, idx))
+
+    def _update(self, idx):
+        tile = self.maze.cells[idx]
+        if tile == 1:
+            return
+        g, blocked = self.g, self.blocked
+        if idx in blocked:
+            rhs = INF
+        elif tile == 2:
+            rhs = 0
+        else:
+            rhs = INF
+            for n_idx in self.neighbours[idx]:
+                if g[n_idx] < rhs and n_idx not in blocked:
+                    rhs = g[n_idx]
+            if rhs != INF:
+                rhs += 1
+        self.rhs[idx] = rhs
+        # Stale heap entries are skipped when popped
+        self.queued.pop(idx, None)
+        if g[idx] != rhs:
+            self._push(idx, self.last_start)
+
+    def _top(self):
+        queue, queued = self.queue, self.queued
+        while queue:
+            key, idx = queue[0]
+            if queued.get(idx) == key:
+                return key, idx
+            heapq.heappop(queue)
+        return None
+
+    def _compute(self, start_idx):
+        g, rhs, neighbours = self.g, self.rhs, self.neighbours
+        while True:
+            top = self._top()
+            if top is None:
+                break
+            key, idx = top
+            if key >= self._key(start_idx, start_idx) and rhs[start_idx] == g[start_idx]:
+                break
+            heapq.heappop(self.queue)
+            del self.queued[idx]
+
+            new_key = self._key(idx, start_idx)
+            if key < new_key:
+                self._push(idx, start_idx)
+                continue
+            self.visited.add(idx)
+            if g[idx] > rhs[idx]:
+                g[idx] = rhs[idx]
+            else:
+                g[idx] = INF
+                self._update(idx)
+            for n_idx in neighbours[idx]:
+                self._update(n_idx)
+
+    def _extract(self, start_idx):
+        cols = self.maze.width
+        g, cells, blocked = self.g, self.maze.cells, self.blocked
+        if g[start_idx] == INF:
+            return []
+        path = [start_idx]
+        idx = start_idx
+        while not (cells[idx] == 2 and idx not in blocked):
+            idx = min((n_idx for n_idx in self.neighbours[idx] if n_idx not in blocked),
+                      key=lambda n_idx: g[n_idx])
+            if g[idx] == INF:
+                return []
+            path.append(idx)
+        return [(idx % cols, idx // cols) for idx in path]
@@ -1,7 +1,10 @@
 # ghost.py
 import pygame
 import random
+from array import array
+from algorithms import DistanceOracle
 from grid import GRID_SIZE
+from maze import as_maze
 
 GHOST_COLORS = [
     (255, 0, 0), (255, 184, 222), (0, 255, 255), (255, 184, 82),
@@ -101,41 +104,8 @@ class Ghost:
                 self.is_moving = False
 
     def draw(self, win):
-        # Ghost Body
-        body_rect_center_x = int(self.pixel_x)
-        body_rect_center_y = int(self.pixel_y) - self.radius // 3 
-        
-        pygame.draw.circle(win, self.color, (body_rect_center_x, body_rect_center_y), self.radius)
-
-        num_spikes = 3
-        spike_width = (2 * self.radius) / (num_spikes * 2 -1) 
-        spike_height = self.radius / 1.5
-
-        for i in range(num_spikes):
-            base_x_left = self.pixel_x - self.radius + (i * 2 * spike_width)
-            base_x_right = base_x_left + spike_width
-            tip_x = base_x_left + spike_width / 2
-            
-            base_y = self.pixel_y + self.radius / 2.5 
-            tip_y = base_y + spike_height
-
-            pygame.draw.polygon(win, self.color, [
-                (base_x_left, base_y), (base_x_right, base_y), (tip_x, tip_y)
-            ])
-        
-        eye_radius = self.radius // 4
-        eye_offset_x = self.radius // 3
-        eye_y = body_rect_center_y - self.radius // 5
-
-        pygame.draw.circle(win, (255,255,255), (body_rect_center_x - eye_offset_x, eye_y), eye_radius)
-        pygame.draw.circle(win, (255,255,255), (body_rect_center_x + eye_offset_x, eye_y), eye_radius)
-        
-        pupil_radius = eye_radius // 2
-        pupil_look_dx = self.current_dx_normalized * pupil_radius * 0.5
-        pupil_look_dy = self.current_dy_normalized * pupil_radius * 0.5
-        
-        pygame.draw.circle(win, (0,0,0), (int(body_rect_center_x - eye_offset_x + pupil_look_dx), int(eye_y + pupil_look_dy)), pupil_radius)
-        pygame.draw.circle(win, (0,0,0), (int(body_rect_center_x + eye_offset_x + pupil_look_dx), int(eye_y + pupil_look_dy)), pupil_radius)
+        return blit_ghost(win, self.color, self.pixel_x, self.pixel_y, self.radius,
+                          self.current_dx_normalized, self.current_dy_normalized)
 
 
     def get_bounding_box(self):
@@ -148,26 +118,361 @@ class Ghost:
     def get_grid_position(self):
         return self.grid_x, self.grid_y
 
+# --- Ghost swarm ---
+# Every ghost of a level in one object, stored as parallel arrays indexed by
+# ghost number instead of one Ghost instance each. Movement is the same as
+# Ghost: a random step to an open neighbour that does not reverse the last
+# move (unless it is the only way out), animated over the same frames with the
+# same float positions.
+#
+# chase is the chance that a ghost at a fork takes the allowed move that brings
+# it closest to Pac-Man instead of a random one. Distances come from one BFS
+# field rooted at Pac-Man's cell, shared by every ghost and only rebuilt (or
+# fetched from the swarm's own small DistanceOracle, kept apart from the ghost
+# fields the planners cache) when Pac-Man enters a new cell, so a chasing
+# ghost costs a few array lookups.
+#
+# A ghost only has work to do when it picks a move and when it arrives, so
+# ghosts are kept in a schedule keyed by tick and update() touches just the
+# ones due that tick (about 2 in every N_FRAMES_PER_CELL). Pixel positions in
+# between are read from a per-cell table of animation frames when needed.
+SWARM_DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]   # index ^ 1 reverses
+NO_DIRECTION = 4
+
+# _SWARM_CHOICES[open_mask][previous direction]: directions a ghost may take
+def _build_swarm_choices():
+    table = []
+    for mask in range(16):
+        open_dirs = tuple(d for d in range(4) if mask & (1 << d))
+        row = []
+        for prev in range(NO_DIRECTION + 1):
+            forward = tuple(d for d in open_dirs if prev == NO_DIRECTION or d != prev ^ 1)
+            row.append(forward if len(open_dirs) > 1 and forward else open_dirs)
+        table.append(row)
+    return table
+
+_SWARM_CHOICES = _build_swarm_choices()
+
+# Cells whose ghosts can touch an actor on a given cell: grid positions are the
+# cells being left, so two actors up to two steps apart can meet halfway
+TOUCH_OFFSETS = [(dx, dy) for dy in range(-2, 3) for dx in range(-2, 3) if abs(dx) + abs(dy) <= 2]
+
+class GhostSwarm:
+    N_FRAMES_PER_CELL = 9
+    FLOW_FIELD_ROWS = 8     # recent Pac-Man cells whose fields are kept
+
+    def __init__(self, start_positions, colors, chase=0.0, distances=None, rng=None):
+        count = len(start_positions)
+        self.colors = list(colors)
+        self.rng = rng or random       # a seeded random.Random makes moves reproducible
+        self.chase = chase
+        self.distances = distances      # flow-field DistanceOracle, made on first use
+        self._field_source = None
+        self._field = None
+        self.speed = GRID_SIZE / self.N_FRAMES_PER_CELL
+        if self.speed <= 0: self.speed = 1
+        self.radius = GRID_SIZE // 2 - 4
+
+        self.grid_x = array('i', [x for x, _ in start_positions])
+        self.grid_y = array('i', [y for _, y in start_positions])
+        self.dx = array('b', [0]) * count
+        self.dy = array('b', [0]) * count
+        self.direction = array('b', [NO_DIRECTION]) * count    # last move, for no-reversing
+        self.moving = bytearray(count)
+        self.depart = array('q', [0]) * count                  # tick of the first step
+        self.track = [None] * count                            # frames of the current step
+
+        self.tick = 0
+        # tick -> ghosts that pick a move (if standing) or arrive (if moving)
+        self.schedule = {1: list(range(count))}
+        # Broad phase: (x, y) grid cell -> ghosts whose grid position it is
+        self.buckets = {}
+        for i, cell in enumerate(zip(self.grid_x, self.grid_y)):
+            self.buckets.setdefault(cell, []).append(i)
+        self._tracks = {}
+
+    def __len__(self):
+        return len(self.grid_x)
+
+    def get_grid_position(self, i):
+        return self.grid_x[i], self.grid_y[i]
+
+    def positions(self):
+        return list(zip(self.grid_x, self.grid_y))
+
+    def _frames(self, start, step):
+        # Positions along one axis after each frame of a move from the cell
+        # centre at start, stepping by step * speed: the same float sums and
+        # clamping Ghost.update does, computed once per start and direction
+        key = (start, step)
+        frames = self._tracks.get(key)
+        if frames is None:
+            target = start + step * GRID_SIZE
+            frames = []
+            pos = start
+            while pos != target:
+                pos += step * self.speed
+                if (step > 0 and pos >= target) or (step < 0 and pos <= target):
+                    pos = target
+                frames.append(pos)
+            frames = self._tracks[key] = tuple(frames)
+        return frames
+
+    def _flow_field(self, maze, pacman_pos_grid):
+        # Flat distances to Pac-Man's cell, shared by all ghosts
+        if pacman_pos_grid != self._field_source:
+            if self.distances is None:
+                self.distances = DistanceOracle(maze, capacity=self.FLOW_FIELD_ROWS)
+            self._field = self.distances.distances_from(pacman_pos_grid)
+            self._field_source = pacman_pos_grid
+        return self._field
+
+    def update(self, current_map, pacman_pos_grid=None):
+        # Advances every ghost one frame. Returns (ghost, old cell) for each
+        # ghost that arrived in a new cell, so callers can keep overlays current.
+        self.tick += 1
+        tick = self.tick
+        due = self.schedule.pop(tick, None)
+        arrived = []
+        if not due:
+            return arrived
+
+        maze = as_maze(current_map)
+        cells, rows, cols = maze.cells, maze.height, maze.width
+        grid_x, grid_y, moving = self.grid_x, self.grid_y, self.moving
+        dxs, dys, direction = self.dx, self.dy, self.direction
+        schedule, half = self.schedule, GRID_SIZE // 2
+        buckets = self.buckets
+        chance = self.rng.random
+        chase = self.chase if pacman_pos_grid is not None else 0.0
+        # Flat index offset of each of SWARM_DIRECTIONS
+        offsets = (cols, -cols, 1, -1)
+        field = None
+
+        for i in due:
+            x, y = grid_x[i], grid_y[i]
+            if moving[i]:
+                arrived.append((i, (x, y)))
+                grid_x[i] = x + dxs[i]
+                grid_y[i] = y + dys[i]
+                bucket = buckets[x, y]
+                bucket.remove(i)
+                if not bucket:
+                    del buckets[x, y]
+                buckets.setdefault((grid_x[i], grid_y[i]), []).append(i)
+                moving[i] = 0
+                schedule.setdefault(tick + 1, []).append(i)
+                continue
+
+            idx = y * cols + x
+            mask = 0
+            if y + 1 < rows and cells[idx + cols] != 1: mask |= 1
+            if y > 0 and cells[idx - cols] != 1: mask |= 2
+            if x + 1 < cols and cells[idx + 1] != 1: mask |= 4
+            if x > 0 and cells[idx - 1] != 1: mask |= 8
+            options = _SWARM_CHOICES[mask][direction[i]]
+            if not options:
+                continue    # walled in: walls never change, so it stays put
+            if len(options) > 1 and chase and chance() < chase:
+                if field is None:
+                    field = self._flow_field(maze, pacman_pos_grid)
+                d = min(options, key=lambda d: field[idx + offsets[d]])
+            else:
+                d = options[int(chance() * len(options))]
+            dx, dy = SWARM_DIRECTIONS[d]
+            direction[i] = d
+            dxs[i], dys[i] = dx, dy
+            moving[i] = 1
+            self.depart[i] = tick
+            if dx:
+                self.track[i] = self._frames(x * GRID_SIZE + half, dx)
+            else:
+                self.track[i] = self._frames(y * GRID_SIZE + half, dy)
+            # The last frame lands on the target; a one-frame move arrives now
+            arrival = tick + len(self.track[i]) - 1
+            if arrival == tick:
+                due.append(i)
+            else:
+                schedule.setdefault(arrival, []).append(i)
+        return arrived
+
+    def pixel_position(self, i):
+        half = GRID_SIZE // 2
+        pixel_x = self.grid_x[i] * GRID_SIZE + half
+        pixel_y = self.grid_y[i] * GRID_SIZE + half
+        if self.moving[i]:
+            pos = self.track[i][self.tick - self.depart[i]]
+            if self.dx[i]:
+                pixel_x = pos
+            else:
+                pixel_y = pos
+        return pixel_x, pixel_y
+
+    def get_bounding_box(self, i):
+        pixel_x, pixel_y = self.pixel_position(i)
+        effective_radius = self.radius * 0.8
+        return pygame.Rect(pixel_x - effective_radius,
+                           pixel_y - effective_radius,
+                           2 * effective_radius,
+                           2 * effective_radius)
+
+    def touches(self, cell, pixel_x, pixel_y, half_size):
+        # True if any ghost's bounding box overlaps the square of half_size
+        # around (pixel_x, pixel_y), for an actor whose grid position is cell.
+        # Same answer as colliderect() against every get_bounding_box(), but
+        # only ghosts listed in TOUCH_OFFSETS cells of cell are tested and no
+        # Rect is built.
+        buckets, tick = self.buckets, self.tick
+        grid_x, grid_y, moving = self.grid_x, self.grid_y, self.moving
+        half = GRID_SIZE // 2
+        left = int(pixel_x - half_size)
+        top = int(pixel_y - half_size)
+        size = int(2 * half_size)
+        effective_radius = self.radius * 0.8
+        ghost_size = int(2 * effective_radius)
+        if size <= 0 or ghost_size <= 0:
+            return False
+        cx, cy = cell
+        for ox, oy in TOUCH_OFFSETS:
+            ids = buckets.get((cx + ox, cy + oy))
+            if not ids:
+                continue
+            for i in ids:
+                gx = grid_x[i] * GRID_SIZE + half
+                gy = grid_y[i] * GRID_SIZE + half
+                if moving[i]:
+                    if self.dx[i]:
+                        gx = self.track[i][tick - self.depart[i]]
+                    else:
+                        gy = self.track[i][tick - self.depart[i]]
+                ghost_left = int(gx - effective_radius)
+                ghost_top = int(gy - effective_radius)
+                if (ghost_left < left + size and left < ghost_left + ghost_size and
+                        ghost_top < top + size and top < ghost_top + ghost_size):
+                    return True
+        return False
+
+    def draw(self, win):
+        # Returns the rect drawn for each ghost
+        colors = self.colors
+        rects = []
+        for i in range(len(self.grid_x)):
+            pixel_x, pixel_y = self.pixel_position(i)
+            rects.append(blit_ghost(win, colors[i % len(colors)], pixel_x, pixel_y,
+                                    self.radius, self.dx[i], self.dy[i]))
+        return rects
+
+# --- Drawing ---
+def draw_ghost(win, color, pixel_x, pixel_y, radius, dx, dy):
+    # Ghost Body
+    body_rect_center_x = int(pixel_x)
+    body_rect_center_y = int(pixel_y) - radius // 3 
+
+    drawn_rect = pygame.draw.circle(win, color, (body_rect_center_x, body_rect_center_y), radius)
+
+    num_spikes = 3
+    spike_width = (2 * radius) / (num_spikes * 2 -1) 
+    spike_height = radius / 1.5
+
+    for i in range(num_spikes):
+        base_x_left = pixel_x - radius + (i * 2 * spike_width)
+        base_x_right = base_x_left + spike_width
+        tip_x = base_x_left + spike_width / 2
+
+        base_y = pixel_y + radius / 2.5 
+        tip_y = base_y + spike_height
+
+        spike_rect = pygame.draw.polygon(win, color, [
+            (base_x_left, base_y), (base_x_right, base_y), (tip_x, tip_y)
+        ])
+        drawn_rect.union_ip(spike_rect)
+
+    eye_radius = radius // 4
+    eye_offset_x = radius // 3
+    eye_y = body_rect_center_y - radius // 5
+
+    pygame.draw.circle(win, (255,255,255), (body_rect_center_x - eye_offset_x, eye_y), eye_radius)
+    pygame.draw.circle(win, (255,255,255), (body_rect_center_x + eye_offset_x, eye_y), eye_radius)
+
+    pupil_radius = eye_radius // 2
+    pupil_look_dx = dx * pupil_radius * 0.5
+    pupil_look_dy = dy * pupil_radius * 0.5
+
+    pygame.draw.circle(win, (0,0,0), (int(body_rect_center_x - eye_offset_x + pupil_look_dx), int(eye_y + pupil_look_dy)), pupil_radius)
+    pygame.draw.circle(win, (0,0,0), (int(body_rect_center_x + eye_offset_x + pupil_look_dx), int(eye_y + pupil_look_dy)), pupil_radius)
+    return drawn_rect
+
+# --- Sprite cache ---
+# Each (color, facing) ghost is drawn once with draw_ghost onto a small
+# per-pixel-alpha Surface, so drawing a ghost is one blit instead of nine
+# draw calls. Facing (0, 0) is a ghost that has not moved yet.
+GHOST_FACINGS = [(0, 0), (0, 1), (0, -1), (1, 0), (-1, 0)]
+_sprite_cache = {}
+
+def ghost_sprite(color, dx, dy, radius):
+    # Returns (surface, anchor_x, anchor_y): the anchor is where the ghost's
+    # pixel position falls inside the sprite
+    key = (color, dx, dy, radius)
+    sprite = _sprite_cache.get(key)
+    if sprite is None:
+        anchor_x = radius + 1
+        anchor_y = radius + radius // 3 + 1
+        width = 2 * radius + 3
+        height = anchor_y + int(radius / 2.5 + radius / 1.5) + 2
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        draw_ghost(surface, color, anchor_x, anchor_y, radius, dx, dy)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        sprite = _sprite_cache[key] = (surface, anchor_x, anchor_y)
+    return sprite
+
+def blit_ghost(win, color, pixel_x, pixel_y, radius, dx, dy):
+    surface, anchor_x, anchor_y = ghost_sprite(color, dx, dy, radius)
+    return win.blit(surface, (int(pixel_x) - anchor_x, int(pixel_y) - anchor_y))
+
+def prerender_ghost_sprites(radius=GRID_SIZE // 2 - 4):
+    # Fills the cache for every GHOST_COLORS entry and facing; call once the
+    # display mode is set so the sprites get the display's pixel format
+    for color in GHOST_COLORS:
+        for dx, dy in GHOST_FACINGS:
+            ghost_sprite(color, dx, dy, radius)
+
 # --- Helper functions (outside class) ---
 def manhattan_distance(p1, p2):
     return abs(p1[0] - p2[0]) + abs(p1[1] - p2[1])
 
-def get_ghost_spawn_points(current_game_map, num_ghosts, pacman_grid_pos, min_distance=4):
-    possible_points = []
-    for r_idx, row_val in enumerate(current_game_map):
-        for c_idx, tile_val in enumerate(row_val):
-            if tile_val == 0:
-                if manhattan_distance((c_idx, r_idx), pacman_grid_pos) >= min_distance:
-                    possible_points.append((c_idx, r_idx))
-    random.shuffle(possible_points)
-    spawn_points = possible_points[:min(num_ghosts, len(possible_points))]
-    while len(spawn_points) < num_ghosts:
+def get_ghost_spawn_points(current_game_map, num_ghosts, pacman_grid_pos, min_distance=4, spawn_candidates=None,
+                           rng=None):
+    rng = rng or random
+    # spawn_candidates: empty (0) cells, e.g. MazeIndex.empty_cells; scanned from the map if not given
+    if spawn_candidates is None:
+        spawn_candidates = [(c_idx, r_idx) for r_idx, row_val in enumerate(current_game_map)
+                            for c_idx, tile_val in enumerate(row_val) if tile_val == 0]
+
+    # Sample distinct points far enough from Pac-Man; cost depends on num_ghosts, not the map
+    spawn_points = []
+    chosen = set()
+    attempts = 0
+    while len(spawn_points) < num_ghosts and spawn_candidates and attempts < num_ghosts * 8:
+        attempts += 1
+        point = rng.choice(spawn_candidates)
+        if point not in chosen and manhattan_distance(point, pacman_grid_pos) >= min_distance:
+            chosen.add(point)
+            spawn_points.append(point)
+
+    if len(spawn_points) < num_ghosts:
+        # Sampling kept missing (few far cells): take what is left from the full list
+        possible_points = [point for point in spawn_candidates if point not in chosen and
+                           manhattan_distance(point, pacman_grid_pos) >= min_distance]
+        rng.shuffle(possible_points)
+        spawn_points.extend(possible_points[:num_ghosts - len(spawn_points)])
+
+    if len(spawn_points) < num_ghosts:
         # If not enough points far enough, fill with random points anyway (except player pos)
-        fallback_points = [(c_idx, r_idx) for r_idx, row_val in enumerate(current_game_map)
-                        for c_idx, tile_val in enumerate(row_val) if tile_val == 0 and (c_idx, r_idx) != pacman_grid_pos]
-        if fallback_points:
-            spawn_points.append(random.choice(fallback_points))
-        else:
-            spawn_points.append(pacman_grid_pos)
+        fallback_points = [point for point in spawn_candidates if point != pacman_grid_pos]
+        while len(spawn_points) < num_ghosts:
+            if fallback_points:
+                spawn_points.append(rng.choice(fallback_points))
+            else:
+                spawn_points.append(pacman_grid_pos)
     return spawn_points
-
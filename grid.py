@@ -6,19 +6,106 @@ ROWS, COLS = 24, 32
 WIDTH = GRID_SIZE * COLS
 HEIGHT = GRID_SIZE * ROWS
 
+BACKGROUND_COLOR = (10,10,10)
+WALL_COLOR = (0,0,255)
+FLOOR_COLOR = (30,30,30)
+FOOD_COLOR = (255,255,0)
+VISITED_FOOD_COLOR = (255,0,0)
+TARGET_COLOR = (0,255,0)
+FRONTIER_COLOR = (0,200,200)
+
+def draw_tile(win, x, y, tile, visited, target_food=None, frontier=()):
+    rect = pygame.Rect(x*GRID_SIZE, y*GRID_SIZE, GRID_SIZE, GRID_SIZE)
+
+    if tile == 1:
+        pygame.draw.rect(win, WALL_COLOR, rect)
+    elif tile == 2:
+        color = VISITED_FOOD_COLOR if (x,y) in visited else FOOD_COLOR
+        pygame.draw.circle(win, color, rect.center, 5)
+    else:
+        pygame.draw.rect(win, FLOOR_COLOR, rect)
+
+    if (x,y) in frontier:
+        # Queued by a search still running
+        pygame.draw.rect(win, FRONTIER_COLOR, rect.inflate(-6, -6), 1)
+    if target_food == (x,y):
+        pygame.draw.rect(win, TARGET_COLOR, rect, 3)  # Highlight target food
+    return rect
+
 def draw_grid(win, visited, game_map, target_food=None):
     for y, row in enumerate(game_map):
         for x, tile in enumerate(row):
-            rect = pygame.Rect(x*GRID_SIZE, y*GRID_SIZE, GRID_SIZE, GRID_SIZE)
+            draw_tile(win, x, y, tile, visited, target_food)
+
+# --- Cached, dirty-tile renderer ---
+# Walls never change within a level, so they are painted once onto a cached
+# background. A second cached surface (the board) holds the background plus
+# the food / visited / frontier / target layer and is patched one tile at a time when
+# that state changes. Each frame only the changed tiles, plus whatever the
+# sprites and HUD covered last frame, are copied back to the window, and the
+# returned rects are the only ones that need pygame.display.update.
+class GridRenderer:
+    def __init__(self, game_map):
+        self.game_map = game_map
+        rows, cols = len(game_map), len(game_map[0])
+
+        self.background = pygame.Surface((cols * GRID_SIZE, rows * GRID_SIZE))
+        self.background.fill(BACKGROUND_COLOR)
+        for y, row in enumerate(game_map):
+            for x, tile in enumerate(row):
+                if tile == 1:
+                    draw_tile(self.background, x, y, tile, ())
 
-            if tile == 1:
-                pygame.draw.rect(win, (0,0,255), rect)
-            elif tile == 2:
-                color = (255,0,0) if (x,y) in visited else (255,255,0)
-                pygame.draw.circle(win, color, rect.center, 5)
-            else:
-                pygame.draw.rect(win, (30,30,30), rect)
+        self.board = self.background.copy()
+        draw_grid(self.board, (), game_map)
+
+        self.visited = set()
+        self.frontier = set()
+        self.target_food = None
+        self.dirty_cells = set()
+        self.needs_full_blit = True
+
+    def mark_dirty(self, cell):
+        # Call after changing game_map at cell (e.g. food eaten)
+        self.dirty_cells.add(cell)
+
+    def invalidate(self):
+        # Next draw copies the whole board, e.g. after another screen was shown
+        self.needs_full_blit = True
+
+    def _sync_board(self, visited, target_food, frontier):
+        dirty = self.dirty_cells
+        if visited != self.visited:
+            dirty.update(visited ^ self.visited)
+            self.visited = set(visited)
+        if frontier != self.frontier:
+            dirty.update(frontier ^ self.frontier)
+            self.frontier = set(frontier)
+        if target_food != self.target_food:
+            for cell in (self.target_food, target_food):
+                if cell is not None:
+                    dirty.add(cell)
+            self.target_food = target_food
+
+        changed_rects = []
+        for x, y in dirty:
+            rect = pygame.Rect(x*GRID_SIZE, y*GRID_SIZE, GRID_SIZE, GRID_SIZE)
+            self.board.blit(self.background, rect, rect)
+            draw_tile(self.board, x, y, self.game_map[y][x], self.visited, target_food,
+                      self.frontier)
+            changed_rects.append(rect)
+        dirty.clear()
+        return changed_rects
 
-            if target_food == (x,y):
-                pygame.draw.rect(win, (0,255,0), rect, 3)  # Highlight target food
+    def restore(self, win, rects):
+        for rect in rects:
+            win.blit(self.board, rect, rect)
 
+    def draw(self, win, visited, target_food=None, frontier=frozenset()):
+        changed_rects = self._sync_board(visited, target_food, frontier)
+        if self.needs_full_blit:
+            self.needs_full_blit = False
+            win.blit(self.board, (0, 0))
+            return [win.get_rect()]
+        self.restore(win, changed_rects)
+        return changed_rects
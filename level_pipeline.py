@@ -0,0 +1,66 @@
+# level_pipeline.py
+# Levels built ahead of time, so starting one is instant.
+#
+# Building a GameSession generates the maze, clears the start cell, indexes
+# the food and empty cells and places the ghosts. The pipeline does that on a
+# background thread while a menu or the win screen is up, keeping up to
+# pool_size ready sessions for the ghost count that screen leads to; take()
+# hands the oldest one over, or builds one on the spot if none was asked for.
+# Builds must not compete with play for the GIL, so take() also cancels the
+# builds that have not started yet (one already running still finishes);
+# the next screen queues them again. Each screen starts one level, so the
+# default pool of one never leaves a build running into play. Every session
+# has its own seed either way, so a prebuilt level replays like any other.
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from simulation import GameSession
+
+class LevelPipeline:
+    def __init__(self, rows, cols, ghost_chase=0.0, pool_size=1):
+        self.rows = rows
+        self.cols = cols
+        self.ghost_chase = ghost_chase
+        self.pool_size = pool_size
+        self.pool = ThreadPoolExecutor(max_workers=1)
+        self.ready = {}     # num_ghosts -> deque of session futures, oldest first
+        self.hits = 0
+        self.misses = 0
+
+    def build(self, num_ghosts):
+        return GameSession.new_level(num_ghosts, self.rows, self.cols,
+                                     ghost_chase=self.ghost_chase)
+
+    def fill(self, num_ghosts):
+        # Queues builds until pool_size levels with num_ghosts are on the way;
+        # levels for any other ghost count are dropped
+        for other in list(self.ready):
+            if other != num_ghosts:
+                for future in self.ready.pop(other):
+                    future.cancel()
+        queue = self.ready.setdefault(num_ghosts, deque())
+        while len(queue) < self.pool_size:
+            queue.append(self.pool.submit(self.build, num_ghosts))
+
+    def take(self, num_ghosts):
+        # Waits for a build already under way rather than starting over
+        queue = self.ready.get(num_ghosts)
+        if queue:
+            self.hits += 1
+            session = queue.popleft().result()
+        else:
+            self.misses += 1
+            session = self.build(num_ghosts)
+        self.pause()
+        return session
+
+    def pause(self):
+        # Cancels the builds still waiting for the worker, keeping finished
+        # (and running) ones for the next take()
+        for queue in self.ready.values():
+            kept = [future for future in queue if not future.cancel()]
+            queue.clear()
+            queue.extend(kept)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
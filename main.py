@@ -1,20 +1,26 @@
 import pygame
 import random
-import copy
-from collections import deque
-from grid import draw_grid, GRID_SIZE, ROWS, COLS
-from pacman import PacMan
-from algorithms import bfs, dfs
-from ghost import Ghost, GHOST_COLORS, get_ghost_spawn_points
-from maze_generator import generate_maze
+from ghost import prerender_ghost_sprites
+from grid import GridRenderer, GRID_SIZE, ROWS, COLS
+from level_pipeline import LevelPipeline
+from plan_worker import PlanWorker
+from profiler import FrameProfiler, NULL_PROFILER
+from replay import Replay
+from simulation import TICK_PLAYING, TICK_WIN, TICK_LOSE
 
 pygame.init()
 WIDTH, HEIGHT = GRID_SIZE * COLS, GRID_SIZE * ROWS
 WIN = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Pac-Man Algo Master")
+prerender_ghost_sprites()
 
 FPS = 60
 game_clock = pygame.time.Clock()
+# The simulation runs at a fixed TICK_RATE whatever the frame rate; after a
+# slow frame at most MAX_TICKS_PER_FRAME ticks are caught up
+TICK_RATE = 60
+TICK_SECONDS = 1 / TICK_RATE
+MAX_TICKS_PER_FRAME = 5
 
 # --- Game States ---
 STATE_START_SCREEN = 0
@@ -24,9 +30,10 @@ STATE_WIN_SCREEN = 3
 current_game_state = STATE_START_SCREEN
 
 # --- Score Variables ---
-current_score = 0
 high_score = 0
 HIGH_SCORE_FILE = "highscore.txt"
+REPLAY_FILE = "last_replay.json"
+TRACE_FILE = "frame_trace.csv"
 
 # --- Font Initialization ---
 try:
@@ -41,17 +48,22 @@ except pygame.error:
     FONT_SMALL = pygame.font.Font(None, 28)
 
 # --- Game Elements ---
-pacman = None
-ghosts = []
-game_MAP = []
-game_START_POS = (0, 0)
-mode = "manual"
-visited_path_nodes = set()
-targeted_food_coord = None
+session = None
+grid_renderer = None
+plan_worker = None      # runs the safest-food plans behind Q / E / ... off the frame
+level_pipeline = None   # builds the next levels while a menu or the win screen is up
 
 NUM_GHOSTS = 5
+GHOST_CHASE = 0.3   # chance a ghost at a fork heads for Pac-Man instead of wandering
+SEARCH_BUDGET = 250 # cells a BFS/DFS replan may expand per tick before resuming next tick
 win_buttons = {"next_level": None, "menu": None}
 
+# --- Profiling ---
+# F3 toggles the per-phase overlay, F4 starts / stops a CSV trace
+profiler = NULL_PROFILER
+profiler_lines = []
+PROFILER_REFRESH_FRAMES = 15    # overlay text is re-rendered this often
+
 # --- Helper Functions ---
 
 def load_high_score():
@@ -76,6 +88,12 @@ def save_high_score():
 
 load_high_score()
 
+def save_replay(result):
+    try:
+        Replay.from_session(session, result).save(REPLAY_FILE)
+    except IOError:
+        print(f"Error: could not save the replay to {REPLAY_FILE}")
+
 def draw_text_button(surface, text, position, font, text_color=(255, 255, 255), rect_color=None, rect_padding=(15, 8), center_align=True):
     text_surface = font.render(text, True, text_color)
     text_rect = text_surface.get_rect()
@@ -108,20 +126,24 @@ def draw_start_screen(surface):
     hs_rect = hs_text_surf.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 130))
     surface.blit(hs_text_surf, hs_rect)
 
-    controls_surf = FONT_SMALL.render("Controls: Arrow Keys/WASD | Q: BFS | E: DFS | N: Next Level | M: Menu", True,
+    controls_surf = FONT_SMALL.render("Controls: Arrow Keys/WASD | N: Next Level | M: Menu | F3/F4: Profile", True,
                                      (180, 180, 180))
     controls_rect = controls_surf.get_rect(center=(WIDTH // 2, HEIGHT - 60))
     surface.blit(controls_surf, controls_rect)
+
+    auto_surf = FONT_SMALL.render("Auto: Q: BFS | E: DFS | G: Graph | Z: A* | J: JPS | I: D* Lite", True, (180, 180, 180))
+    auto_rect = auto_surf.get_rect(center=(WIDTH // 2, HEIGHT - 35))
+    surface.blit(auto_surf, auto_rect)
     return start_btn_rect, quit_btn_rect
 
 def draw_game_over_screen(surface):
-    global current_score, high_score
+    global session, high_score
     surface.fill((30, 10, 10))
     go_text_surf = FONT_TITLE.render("GAME OVER", True, (255, 60, 60))
     go_rect = go_text_surf.get_rect(center=(WIDTH // 2, HEIGHT // 4))
     surface.blit(go_text_surf, go_rect)
 
-    score_surf = FONT_SCORE.render(f"Your Score: {current_score}", True, (255, 255, 255))
+    score_surf = FONT_SCORE.render(f"Your Score: {session.score}", True, (255, 255, 255))
     score_rect = score_surf.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 40))
     surface.blit(score_surf, score_rect)
 
@@ -136,13 +158,50 @@ def draw_game_over_screen(surface):
     return restart_btn_rect, menu_btn_rect
 
 def draw_playing_hud(surface):
-    global current_score, high_score
-    score_text_surf = FONT_SCORE.render(f"Score: {current_score}", True, (255, 255, 255))
-    surface.blit(score_text_surf, (15, 10))
+    global session, high_score
+    score_text_surf = FONT_SCORE.render(f"Score: {session.score}", True, (255, 255, 255))
+    score_rect = surface.blit(score_text_surf, (15, 10))
 
     hs_text_surf = FONT_SCORE.render(f"High: {high_score}", True, (255, 255, 0))
     hs_rect = hs_text_surf.get_rect(topright=(WIDTH - 15, 10))
     surface.blit(hs_text_surf, hs_rect)
+    return [score_rect, hs_rect]
+
+def draw_profiler_overlay(surface):
+    global profiler_lines
+    if not profiler_lines or profiler.frames % PROFILER_REFRESH_FRAMES == 0:
+        rows = [f"{name:<9} p50 {p50:6.2f}  p99 {p99:6.2f} ms" for name, p50, p99 in profiler.summary()]
+        rows.append(f"expanded {profiler.total_expanded}" + ("  REC" if profiler.recording else ""))
+        profiler_lines = [FONT_SMALL.render(row, True, (0, 255, 160), (0, 0, 0)) for row in rows]
+    rects = []
+    y = 45
+    for line_surf in profiler_lines:
+        rects.append(surface.blit(line_surf, (15, y)))
+        y += line_surf.get_height()
+    return rects
+
+def toggle_profiler():
+    global profiler, profiler_lines
+    if profiler.recording:
+        save_trace()
+    profiler = NULL_PROFILER if profiler.enabled else FrameProfiler()
+    profiler_lines = []
+    session.profiler = profiler
+
+def toggle_trace():
+    if not profiler.enabled:
+        toggle_profiler()
+    if profiler.recording:
+        save_trace()
+    else:
+        profiler.start_trace()
+
+def save_trace():
+    try:
+        frames = profiler.save_trace(TRACE_FILE)
+        print(f"Saved {frames} frames to {TRACE_FILE}")
+    except IOError:
+        print(f"Error: could not save the frame trace to {TRACE_FILE}")
 
 def draw_win_screen(surface):
     surface.fill((10, 30, 10))
@@ -157,126 +216,36 @@ def draw_win_screen(surface):
 
     return restart_btn_rect, menu_btn_rect
 
-def is_food_left(game_map):
-    for row in game_map:
-        if 2 in row:
-            return True
-    return False
-
-# --- BFS distance map from ghost positions ---
-def bfs_distance_map(start_pos, maze):
-    rows, cols = len(maze), len(maze[0])
-    dist = [[-1]*cols for _ in range(rows)]
-    queue = deque()
-    sx, sy = start_pos
-    dist[sy][sx] = 0
-    queue.append((sx, sy))
-
-    while queue:
-        x, y = queue.popleft()
-        for dx, dy in [(-1,0),(1,0),(0,-1),(0,1)]:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < cols and 0 <= ny < rows:
-                if maze[ny][nx] != 1 and dist[ny][nx] == -1:
-                    dist[ny][nx] = dist[y][x] + 1
-                    queue.append((nx, ny))
-    return dist
-
-# --- Combined ghost distance map ---
-def combined_ghost_distance_map(ghosts, maze):
-    rows, cols = len(maze), len(maze[0])
-    combined = [[float('inf')] * cols for _ in range(rows)]
-
-    for ghost in ghosts:
-        gx, gy = ghost.get_grid_position()
-        dist_map = bfs_distance_map((gx, gy), maze)
-        for y in range(rows):
-            for x in range(cols):
-                if dist_map[y][x] != -1:
-                    combined[y][x] = min(combined[y][x], dist_map[y][x])
-    return combined
-
-# --- Predictive pathfinding: safest path to food ---
-def is_food_safe(food_pos, ghosts):
-    x, y = food_pos
-    neighbors = [(x-2, y), (x+2, y), (x, y-2), (x, y+2)]
-    for ghost in ghosts:
-        gx, gy = ghost.get_grid_position()
-        if (gx, gy) in neighbors:
-            return False
-    return True
-
-def find_safest_food_path(start_grid_pos):
-    global mode, game_MAP, ghosts
-    algo_func = bfs if mode == "bfs" else dfs
-
-    map_with_ghosts = copy.deepcopy(game_MAP)
-    for ghost in ghosts:
-        gx, gy = ghost.get_grid_position()
-        map_with_ghosts[gy][gx] = 1
-
-    ghost_dist_map = combined_ghost_distance_map(ghosts, game_MAP)
-
-    rows, cols = len(game_MAP), len(game_MAP[0])
-    food_positions = [(x, y) for y in range(rows) for x in range(cols) if game_MAP[y][x] == 2]
-
-    best_path = []
-    best_safety_score = -1
-
-    for food_pos in food_positions:
-        if not is_food_safe(food_pos, ghosts):
-            continue  # skip unsafe food
-
-        path, _ = algo_func(start_grid_pos, lambda x,y: (x,y) == food_pos, map_with_ghosts)
-        if not path:
-            continue
-
-        safety_score = min(ghost_dist_map[y][x] for x,y in path)
-        if safety_score > best_safety_score:
-            best_safety_score = safety_score
-            best_path = path
-
-    return best_path
-
 def initialize_game_elements():
-    global pacman, ghosts, game_MAP, game_START_POS, visited_path_nodes, mode, current_score, targeted_food_coord, NUM_GHOSTS
+    global session, grid_renderer, NUM_GHOSTS
 
     print("Initializing game elements...")
-    game_MAP, game_START_POS = generate_maze(ROWS, COLS)
-
-    # Ensure the start position is not a food tile
-    start_x, start_y = game_START_POS
-    if game_MAP[start_y][start_x] == 2:
-        game_MAP[start_y][start_x] = 0
-
-    pacman = PacMan(game_START_POS)
-
-    ghosts.clear()
-    ghost_spawn_positions = get_ghost_spawn_points(game_MAP, NUM_GHOSTS, game_START_POS)
-    for i in range(NUM_GHOSTS):
-        grid_pos = ghost_spawn_positions[i]
-        color_idx = i % len(GHOST_COLORS)
-        ghosts.append(Ghost(grid_pos, GHOST_COLORS[color_idx]))
-
-    visited_path_nodes.clear()
-    mode = "manual"
-    current_score = 0
-    targeted_food_coord = None
+    session = level_pipeline.take(NUM_GHOSTS)
+    session.profiler = profiler
+    session.planner = plan_worker
+    session.search_budget = SEARCH_BUDGET
+    grid_renderer = GridRenderer(session.game_map)
 
 
 def game_controller():
-    global current_game_state, run_game_flag, high_score, current_score
-    global pacman, ghosts, game_MAP, mode, visited_path_nodes, targeted_food_coord, NUM_GHOSTS, win_buttons
+    global current_game_state, run_game_flag, high_score
+    global session, grid_renderer, NUM_GHOSTS, win_buttons, plan_worker, level_pipeline
 
+    plan_worker = PlanWorker()
+    level_pipeline = LevelPipeline(ROWS, COLS, GHOST_CHASE)
     run_game_flag = True
     start_screen_buttons = {"start": None, "quit": None}
     game_over_buttons = {"restart": None, "menu": None}
     win_buttons = {"next_level": None, "menu": None}
+    drawn_game_state = None
+    sprite_rects = []
+    tick_time = 0.0
 
     initialize_game_elements()
     current_game_state = STATE_START_SCREEN
 
     while run_game_flag:
+        profiler.begin_frame()
         mouse_pos = pygame.mouse.get_pos()
 
         for event in pygame.event.get():
@@ -310,29 +279,24 @@ def game_controller():
                         dy_m = 1
 
                     if dx_m != 0 or dy_m != 0:
-                        mode = "manual"
-                        pacman.path = []
-                        targeted_food_coord = None
-                        pacman.set_target_direction(dx_m, dy_m, game_MAP)
+                        session.steer(dx_m, dy_m)
 
                     elif event.key == pygame.K_q:  # BFS
-                        mode = "bfs"
-                        pacman.path = []
-                        path_full = find_safest_food_path((pacman.grid_x, pacman.grid_y))
-                        if path_full:
-                            pacman.path = path_full[1:]
-                            targeted_food_coord = path_full[-1]
-                        else:
-                            targeted_food_coord = None
+                        session.start_auto_mode("bfs")
                     elif event.key == pygame.K_e:  # DFS
-                        mode = "dfs"
-                        pacman.path = []
-                        path_full = find_safest_food_path((pacman.grid_x, pacman.grid_y))
-                        if path_full:
-                            pacman.path = path_full[1:]
-                            targeted_food_coord = path_full[-1]
-                        else:
-                            targeted_food_coord = None
+                        session.start_auto_mode("dfs")
+                    elif event.key == pygame.K_g:  # Corridor graph
+                        session.start_auto_mode("graph")
+                    elif event.key == pygame.K_z:  # A*
+                        session.start_auto_mode("astar")
+                    elif event.key == pygame.K_j:  # Jump point search
+                        session.start_auto_mode("jps")
+                    elif event.key == pygame.K_i:  # Incremental D* Lite
+                        session.start_auto_mode("dstar")
+                    elif event.key == pygame.K_F3:
+                        toggle_profiler()
+                    elif event.key == pygame.K_F4:
+                        toggle_trace()
 
             elif current_game_state == STATE_GAME_OVER:
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -364,85 +328,78 @@ def game_controller():
                     elif event.key == pygame.K_m:
                         current_game_state = STATE_START_SCREEN
 
+        profiler.mark("input")
+
         # --- Game Logic Update ---
         if current_game_state == STATE_PLAYING:
-            pacman_reached_cell = pacman.update(game_MAP)
-            for ghost in ghosts:
-                ghost.update(game_MAP, (pacman.grid_x, pacman.grid_y))
-
-            # Check collision with ghosts
-            pacman_bb = pacman.get_bounding_box()
-            for ghost in ghosts:
-                if pacman_bb.colliderect(ghost.get_bounding_box()):
-                    if current_score > high_score:
-                        high_score = current_score
-                        save_high_score()
-                    current_game_state = STATE_GAME_OVER
-                    targeted_food_coord = None
-                    break
-            if current_game_state == STATE_GAME_OVER:
-                continue
-
-            # Recalculate BFS/DFS path when Pac-Man reaches a new cell or path is empty
-            if mode in ["bfs", "dfs"] and (not pacman.path or pacman_reached_cell):
-                # Create a deep copy of the map and mark ghosts as walls
-                map_with_ghosts = copy.deepcopy(game_MAP)
-                for ghost in ghosts:
-                    gx, gy = ghost.get_grid_position()
-                    map_with_ghosts[gy][gx] = 1
-
-                algo_func = bfs if mode == "bfs" else dfs
-                path_full, visited_cells = algo_func(
-                    (pacman.grid_x, pacman.grid_y),
-                    lambda x, y: map_with_ghosts[y][x] == 2,
-                    map_with_ghosts
-                )
-
-                visited_path_nodes.clear()
-                visited_path_nodes.update(visited_cells)
-
-                if path_full:
-                    pacman.path = path_full[1:]
-                    targeted_food_coord = path_full[-1]
-                else:
-                    pacman.path = []
-                    targeted_food_coord = None
-
-            # Eating food and scoring
-            if pacman_reached_cell:
-                cx, cy = pacman.grid_x, pacman.grid_y
-                if game_MAP[cy][cx] == 2:
-                    game_MAP[cy][cx] = 0
-                    current_score += 10
-                    if targeted_food_coord == (cx, cy):
-                        targeted_food_coord = None
-
-                    # Check win condition
-                    if not is_food_left(game_MAP):
-                        current_game_state = STATE_WIN_SCREEN
+            tick_result = TICK_PLAYING
+            tick_time = min(tick_time, MAX_TICKS_PER_FRAME * TICK_SECONDS)
+            while tick_time >= TICK_SECONDS and tick_result == TICK_PLAYING:
+                tick_time -= TICK_SECONDS
+                tick_result = session.tick()
+                if session.last_eaten_food:
+                    grid_renderer.mark_dirty(session.last_eaten_food)
+
+            if tick_result == TICK_LOSE:
+                if session.score > high_score:
+                    high_score = session.score
+                    save_high_score()
+                save_replay(tick_result)
+                current_game_state = STATE_GAME_OVER
+            elif tick_result == TICK_WIN:
+                save_replay(tick_result)
+                current_game_state = STATE_WIN_SCREEN
+        else:
+            tick_time = 0.0
 
         # --- Drawing ---
-        WIN.fill((10, 10, 10))
-        if current_game_state == STATE_START_SCREEN:
-            btn_s, btn_q = draw_start_screen(WIN)
-            start_screen_buttons["start"], start_screen_buttons["quit"] = btn_s, btn_q
-        elif current_game_state == STATE_PLAYING:
-            draw_grid(WIN, visited_path_nodes, game_MAP, targeted_food_coord)
-            if pacman:
-                pacman.draw(WIN)
-            for ghost in ghosts:
-                ghost.draw(WIN)
-            draw_playing_hud(WIN)
-        elif current_game_state == STATE_GAME_OVER:
-            btn_r, btn_m = draw_game_over_screen(WIN)
-            game_over_buttons["restart"], game_over_buttons["menu"] = btn_r, btn_m
-        elif current_game_state == STATE_WIN_SCREEN:
-            btn_n, btn_m = draw_win_screen(WIN)
-            win_buttons["next_level"], win_buttons["menu"] = btn_n, btn_m
-
-        pygame.display.update()
-        game_clock.tick(FPS)
-
+        if current_game_state == STATE_PLAYING:
+            # Only changed tiles and the areas covered by last frame's sprites
+            # and HUD are redrawn, and only those rects are pushed to the display
+            if drawn_game_state != STATE_PLAYING:
+                grid_renderer.invalidate()
+            dirty_rects = grid_renderer.draw(WIN, session.visited_path_nodes, session.targeted_food_coord,
+                                             session.search_frontier)
+            grid_renderer.restore(WIN, sprite_rects)
+            dirty_rects.extend(sprite_rects)
+            profiler.mark("grid")
+
+            sprite_rects = []
+            sprite_rects.append(session.pacman.draw(WIN))
+            sprite_rects.extend(session.ghosts.draw(WIN))
+            profiler.mark("sprites")
+            sprite_rects.extend(draw_playing_hud(WIN))
+            if profiler.enabled:
+                sprite_rects.extend(draw_profiler_overlay(WIN))
+            dirty_rects.extend(sprite_rects)
+            profiler.mark("hud")
+
+            pygame.display.update(dirty_rects)
+        else:
+            if drawn_game_state != current_game_state:
+                # Build the levels this screen can lead to while it is showing
+                level_pipeline.fill(NUM_GHOSTS + 1 if current_game_state == STATE_WIN_SCREEN else NUM_GHOSTS)
+            WIN.fill((10, 10, 10))
+            if current_game_state == STATE_START_SCREEN:
+                btn_s, btn_q = draw_start_screen(WIN)
+                start_screen_buttons["start"], start_screen_buttons["quit"] = btn_s, btn_q
+            elif current_game_state == STATE_GAME_OVER:
+                btn_r, btn_m = draw_game_over_screen(WIN)
+                game_over_buttons["restart"], game_over_buttons["menu"] = btn_r, btn_m
+            elif current_game_state == STATE_WIN_SCREEN:
+                btn_n, btn_m = draw_win_screen(WIN)
+                win_buttons["next_level"], win_buttons["menu"] = btn_n, btn_m
+
+            pygame.display.update()
+        profiler.mark("display")
+        drawn_game_state = current_game_state
+        profiler.end_frame()
+        tick_time += game_clock.tick(FPS) / 1000
+
+    if profiler.recording:
+        save_trace()
+    plan_worker.shutdown()
+    level_pipeline.shutdown()
     pygame.quit()
 
 if __name__ == "__main__":
@@ -0,0 +1,174 @@
+# maze.py
+# Compact maze storage: one byte per cell in a flat bytearray, indexed by
+# y * width + x, with the same tile values as before (0 path, 1 wall, 2 food).
+#
+# maze[y][x] still works everywhere a list of lists was used: maze[y] is a
+# memoryview of that row, so reads and writes go straight to the buffer.
+# Hot loops should use maze.cells with flat indexes instead.
+
+class Maze:
+    def __init__(self, width, height, cells=None, fill=0):
+        self.width = width
+        self.height = height
+        if cells is None:
+            cells = bytearray([fill]) * (width * height)
+        elif not isinstance(cells, bytearray):
+            cells = bytearray(cells)
+        if len(cells) != width * height:
+            raise ValueError(f"expected {width * height} cells, got {len(cells)}")
+        self.cells = cells
+        view = memoryview(cells)
+        self._rows = [view[y * width:(y + 1) * width] for y in range(height)]
+        self._neighbours = None     # see open_neighbours()
+
+    @classmethod
+    def from_rows(cls, rows):
+        height, width = len(rows), len(rows[0])
+        cells = bytearray(width * height)
+        for y, row in enumerate(rows):
+            cells[y * width:(y + 1) * width] = bytes(row)
+        return cls(width, height, cells)
+
+    def to_rows(self):
+        return [list(row) for row in self._rows]
+
+    # --- List-of-lists compatibility ---
+    def __len__(self):
+        return self.height
+
+    def __getitem__(self, y):
+        return self._rows[y]
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __eq__(self, other):
+        if isinstance(other, Maze):
+            return self.width == other.width and self.cells == other.cells
+        return NotImplemented
+
+    # --- Flat access ---
+    def index(self, x, y):
+        return y * self.width + x
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def get(self, x, y):
+        return self.cells[y * self.width + x]
+
+    def set(self, x, y, tile):
+        self.cells[y * self.width + x] = tile
+
+    # --- Copies ---
+    # A copy is a single memcpy of width * height bytes, so copy.deepcopy()
+    # on a Maze stays cheap even on very large maps.
+    def copy(self):
+        return Maze(self.width, self.height, bytearray(self.cells))
+
+    def __copy__(self):
+        return self.copy()
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def __reduce__(self):
+        # memoryviews don't pickle; rebuild them from the buffer
+        return (Maze, (self.width, self.height, self.cells))
+
+def as_maze(grid):
+    # Lets the search functions take either a Maze or a plain list of lists
+    return grid if isinstance(grid, Maze) else Maze.from_rows(grid)
+
+# --- Neighbour table ---
+# Searches try the four steps in this order, which decides the path they
+# return when several are equally short.
+BFS_DIRECTIONS = [(-1,0),(1,0),(0,-1),(0,1)]
+
+def open_neighbours(maze):
+    # Open neighbours of every cell as tuples of flat indexes (() for walls),
+    # in BFS_DIRECTIONS order. Built on first use and kept on the Maze: only
+    # walls matter, and they never change once a level is generated.
+    if maze._neighbours is None:
+        cells, rows, cols = maze.cells, maze.height, maze.width
+        maze._neighbours = [
+            () if cells[idx] == 1 else
+            tuple((idx // cols + dy) * cols + idx % cols + dx for dx, dy in BFS_DIRECTIONS
+                  if 0 <= idx % cols + dx < cols and 0 <= idx // cols + dy < rows
+                  and cells[(idx // cols + dy) * cols + idx % cols + dx] != 1)
+            for idx in range(rows * cols)
+        ]
+    return maze._neighbours
+
+# --- Food / empty-cell index ---
+# Built once per level with a single scan, then kept current in O(1) per eaten
+# pellet, so the win check, food enumeration and ghost spawning never rescan
+# the map.
+class MazeIndex:
+    def __init__(self, maze):
+        self.maze = maze
+        self.empty_cells = []   # open cells without food: ghost spawn candidates
+        self.food = set()
+        for y, row in enumerate(maze):
+            for x, tile in enumerate(row):
+                if tile == 2:
+                    self.food.add((x, y))
+                elif tile == 0:
+                    self.empty_cells.append((x, y))
+
+    @property
+    def food_count(self):
+        return len(self.food)
+
+    def food_left(self):
+        return bool(self.food)
+
+    def eat(self, x, y):
+        # Clears the food at (x, y); returns False if there was none
+        if (x, y) not in self.food:
+            return False
+        self.food.remove((x, y))
+        self.maze.set(x, y, 0)
+        self.empty_cells.append((x, y))
+        return True
+
+# --- Blocked-cell overlay ---
+# Extra blocked cells (e.g. ghosts) laid over a Maze without copying it.
+# cells maps flat index -> number of blockers on that cell, so searches can
+# test "n_idx in overlay.cells" and two ghosts sharing a cell are handled.
+class CellOverlay:
+    def __init__(self, width, positions=()):
+        self.width = width
+        self.cells = {}
+        for x, y in positions:
+            self.add(x, y)
+
+    def add(self, x, y):
+        idx = y * self.width + x
+        self.cells[idx] = self.cells.get(idx, 0) + 1
+
+    def remove(self, x, y):
+        idx = y * self.width + x
+        count = self.cells[idx] - 1
+        if count:
+            self.cells[idx] = count
+        else:
+            del self.cells[idx]
+
+    def move(self, old_pos, new_pos):
+        if old_pos != new_pos:
+            self.remove(*old_pos)
+            self.add(*new_pos)
+
+    def __contains__(self, pos):
+        x, y = pos
+        return y * self.width + x in self.cells
+
+def blocked_indices(blocked, width):
+    # Normalises a search's blocked argument to something supporting
+    # "flat_index in result": a CellOverlay, or any iterable of (x, y)
+    if blocked is None:
+        return ()
+    if isinstance(blocked, CellOverlay):
+        return blocked.cells
+    return {y * width + x for x, y in blocked}
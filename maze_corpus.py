@@ -0,0 +1,168 @@
+# maze_corpus.py
+# Many mazes in one compact binary file, read back through mmap.
+#
+# Layout, all little-endian:
+#   header   magic b"PMZC", version u16, flags u16, maze count u32,
+#            offset of the index u64
+#   records  per maze: width u16, height u16, start x u16, start y u16,
+#            seed u64 (NO_SEED if unknown), then the wall bitmap and the food
+#            bitmap, ceil(width * height / 8) bytes each; cell i is bit i % 8
+#            of byte i // 8, row-major like Maze.cells
+#   index    one u64 record offset per maze
+#
+# The index comes last so a corpus can be written as a stream of mazes
+# without knowing how many there will be. Opening a corpus maps the file and
+# reads nothing else; record(k) is a few struct reads and two memoryviews
+# into the mapping, and load(k) unpacks just that maze into a Maze.
+#
+#   python maze_corpus.py build corpus.pmz --count 1000 --rows 24 --cols 32
+#   python maze_corpus.py info corpus.pmz
+import argparse
+import mmap
+import struct
+
+from maze import Maze
+from maze_generator import generate_maze
+
+MAGIC = b"PMZC"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIQ")
+RECORD = struct.Struct("<HHHHQ")
+OFFSET = struct.Struct("<Q")
+NO_SEED = 2**64 - 1
+
+# --- Bit packing ---
+# Byte value -> its 8 cells as tile bytes, lowest bit first
+_UNPACK_WALLS = [bytes((v >> i) & 1 for i in range(8)) for v in range(256)]
+_UNPACK_FOOD = [bytes(((v >> i) & 1) * 2 for i in range(8)) for v in range(256)]
+_PACK = {cells: v for v, cells in enumerate(_UNPACK_WALLS)}
+# Tile -> 1 where the tile is a wall / food, for bytes.translate
+_WALL_MASK = bytes(int(tile == 1) for tile in range(256))
+_FOOD_MASK = bytes(int(tile == 2) for tile in range(256))
+
+def bitmap_size(width, height):
+    return (width * height + 7) // 8
+
+def pack_bits(mask):
+    # mask holds one 0/1 byte per cell
+    mask = bytes(mask) + bytes(-len(mask) % 8)
+    return bytes(map(_PACK.__getitem__, (mask[i:i + 8] for i in range(0, len(mask), 8))))
+
+def unpack_cells(walls, food, size):
+    # Tile bytes for a record's two bitmaps; a cell is never both
+    wall_cells = b"".join(map(_UNPACK_WALLS.__getitem__, walls))[:size]
+    food_cells = b"".join(map(_UNPACK_FOOD.__getitem__, food))[:size]
+    cells = int.from_bytes(wall_cells, "little") | int.from_bytes(food_cells, "little")
+    return bytearray(cells.to_bytes(size, "little"))
+
+# --- Writing ---
+def write_corpus(path, mazes):
+    # mazes: iterable of (maze, start, seed), seed None if unknown; consumed
+    # one at a time. Returns the number of mazes written.
+    offsets = []
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, 0, 0))
+        for maze, start, seed in mazes:
+            offsets.append(f.tell())
+            cells = maze.cells
+            f.write(RECORD.pack(maze.width, maze.height, start[0], start[1],
+                                NO_SEED if seed is None else seed))
+            f.write(pack_bits(cells.translate(_WALL_MASK)))
+            f.write(pack_bits(cells.translate(_FOOD_MASK)))
+        index_offset = f.tell()
+        for offset in offsets:
+            f.write(OFFSET.pack(offset))
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(offsets), index_offset))
+    return len(offsets)
+
+def build_corpus(path, seeds, rows, cols):
+    # Exactly the mazes generate_maze(rows, cols, seed) gives for each seed
+    return write_corpus(path, (generate_maze(rows, cols, seed) + (seed,) for seed in seeds))
+
+# --- Reading ---
+class MazeCorpus:
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self.count, self.index_offset = HEADER.unpack_from(self.data)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a maze corpus")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"unsupported maze corpus version {version}")
+
+    def __len__(self):
+        return self.count
+
+    def record(self, k):
+        # (width, height, start, seed, walls, food) for maze k; the bitmaps
+        # are memoryviews into the mapping, valid until close()
+        if not 0 <= k < self.count:
+            raise IndexError(f"maze {k} out of range for a corpus of {self.count}")
+        offset, = OFFSET.unpack_from(self.data, self.index_offset + k * OFFSET.size)
+        width, height, start_x, start_y, seed = RECORD.unpack_from(self.data, offset)
+        size = bitmap_size(width, height)
+        walls_at = offset + RECORD.size
+        view = memoryview(self.data)
+        walls = view[walls_at:walls_at + size]
+        food = view[walls_at + size:walls_at + 2 * size]
+        return width, height, (start_x, start_y), None if seed == NO_SEED else seed, walls, food
+
+    def seed(self, k):
+        return self.record(k)[3]
+
+    def load(self, k):
+        # (maze, start) like generate_maze
+        width, height, start, _, walls, food = self.record(k)
+        maze = Maze(width, height, unpack_cells(walls, food, width * height))
+        walls.release()
+        food.release()
+        return maze, start
+
+    def __iter__(self):
+        # Streams (maze, start, seed) in corpus order
+        for k in range(self.count):
+            maze, start = self.load(k)
+            yield maze, start, self.seed(k)
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or inspect a binary maze corpus.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="generate mazes from consecutive seeds")
+    build.add_argument("path")
+    build.add_argument("--count", type=int, default=1000)
+    build.add_argument("--base-seed", type=int, default=0)
+    build.add_argument("--rows", type=int, default=24)
+    build.add_argument("--cols", type=int, default=32)
+    info = commands.add_parser("info", help="summarise a corpus")
+    info.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        seeds = range(args.base_seed, args.base_seed + args.count)
+        count = build_corpus(args.path, seeds, args.rows, args.cols)
+        print(f"wrote {count} {args.rows}x{args.cols} mazes to {args.path}")
+    else:
+        with MazeCorpus(args.path) as corpus:
+            sizes = {}
+            for k in range(len(corpus)):
+                width, height, _, _, walls, food = corpus.record(k)
+                sizes[height, width] = sizes.get((height, width), 0) + 1
+                walls.release()
+                food.release()
+            print(f"{args.path}: {len(corpus)} mazes, {len(corpus.data)} bytes")
+            for (rows, cols), count in sorted(sizes.items()):
+                print(f"  {rows}x{cols}: {count}")
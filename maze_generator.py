@@ -1,52 +1,66 @@
 import random
+from maze import Maze
 
-def generate_maze(rows, cols):
-    # Fill with walls
-    maze = [[1 for _ in range(cols)] for _ in range(rows)]
-
-    def in_bounds(x, y):
-        return 0 <= x < cols and 0 <= y < rows
-
-    def neighbors(x, y):
-        dirs = [(-2, 0), (2, 0), (0, -2), (0, 2)]
-        return [(x + dx, y + dy) for dx, dy in dirs if in_bounds(x + dx, y + dy)]
-
-    # Initial carving using Prim's
-    start_x, start_y = random.randrange(1, cols, 2), random.randrange(1, rows, 2)
-    maze[start_y][start_x] = 0
-    walls = [(start_x + dx, start_y + dy, start_x, start_y)
-             for dx, dy in [(-2, 0), (2, 0), (0, -2), (0, 2)]
-             if in_bounds(start_x + dx, start_y + dy)]
-
-    while walls:
-        wx, wy, px, py = walls.pop(random.randint(0, len(walls) - 1))
-        if maze[wy][wx] == 1:
-            maze[wy][wx] = 0
-            maze[(wy + py) // 2][(wx + px) // 2] = 0
-            for dx, dy in [(-2, 0), (2, 0), (0, -2), (0, 2)]:
-                nx, ny = wx + dx, wy + dy
-                if in_bounds(nx, ny) and maze[ny][nx] == 1:
-                    walls.append((nx, ny, wx, wy))
+def generate_maze(rows, cols, seed=None):
+    # All randomness (carving, loops, food) comes from one RNG: a private
+    # random.Random(seed) when a seed is given, else the global random module
+    rng = random.Random(seed) if seed is not None else random
+    chance = rng.random
+
+    # Fill with walls; cells are addressed by flat index y * cols + x
+    maze = Maze(cols, rows, fill=1)
+    cells = maze.cells
+
+    # Initial carving using Prim's. Frontier entries are (cell two steps
+    # away, wall in between). A random entry is taken by swapping it with the
+    # last one and popping, so each step is O(1) and the carve is linear.
+    start_x, start_y = rng.randrange(1, cols, 2), rng.randrange(1, rows, 2)
+    cells[start_y * cols + start_x] = 0
+    walls = []
+    cell_idx = start_y * cols + start_x
+    while True:
+        x, y = cell_idx % cols, cell_idx // cols
+        if x >= 2 and cells[cell_idx - 2] == 1:
+            walls.append((cell_idx - 2, cell_idx - 1))
+        if x + 2 < cols and cells[cell_idx + 2] == 1:
+            walls.append((cell_idx + 2, cell_idx + 1))
+        if y >= 2 and cells[cell_idx - 2 * cols] == 1:
+            walls.append((cell_idx - 2 * cols, cell_idx - cols))
+        if y + 2 < rows and cells[cell_idx + 2 * cols] == 1:
+            walls.append((cell_idx + 2 * cols, cell_idx + cols))
+
+        # Find the next frontier cell that is still a wall
+        cell_idx = -1
+        while walls:
+            i = int(chance() * len(walls))
+            walls[i], walls[-1] = walls[-1], walls[i]
+            next_idx, between_idx = walls.pop()
+            if cells[next_idx] == 1:
+                cells[next_idx] = 0
+                cells[between_idx] = 0
+                cell_idx = next_idx
+                break
+        if cell_idx == -1:
+            break
 
     # 🌟 Add extra connections to reduce dead ends and make loops
     extra_connections = (rows * cols) // 15  # Adjust density here
-    for _ in range(extra_connections):
-        x = random.randrange(1, cols - 1, 2)
-        y = random.randrange(1, rows - 1, 2)
-
-        # Pick a random direction to knock down a wall
-        dirs = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        random.shuffle(dirs)
-        for dx, dy in dirs:
-            nx, ny = x + dx, y + dy
-            if in_bounds(nx, ny) and maze[ny][nx] == 1:
-                maze[ny][nx] = 0
-                break  # Add one connection per loop
+    odd_xs = range(1, cols - 1, 2)
+    odd_ys = range(1, rows - 1, 2)
+    if odd_xs and odd_ys:
+        for _ in range(extra_connections):
+            x = odd_xs[int(chance() * len(odd_xs))]
+            y = odd_ys[int(chance() * len(odd_ys))]
+
+            # Knock down one of the surrounding walls, picked uniformly
+            idx = y * cols + x
+            candidates = [n for n in (idx - 1, idx + 1, idx - cols, idx + cols) if cells[n] == 1]
+            if candidates:
+                cells[candidates[int(chance() * len(candidates))]] = 0
 
     # 🟡 Place food randomly on path tiles
-    for y in range(rows):
-        for x in range(cols):
-            if maze[y][x] == 0 and random.random() < 0.3:
-                maze[y][x] = 2
+    for idx in range(rows * cols):
+        if cells[idx] == 0 and chance() < 0.3:
+            cells[idx] = 2
 
     return maze, (start_x, start_y)
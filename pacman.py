@@ -1,5 +1,6 @@
 # pacman.py
 import pygame
+from collections import deque
 from grid import GRID_SIZE 
 
 class PacMan:
@@ -20,7 +21,7 @@ class PacMan:
         self.current_dy_normalized = 0 
         self.is_moving = False
         
-        self.path = [] 
+        self.path = deque() 
         self.radius = GRID_SIZE // 2 - 3 
         self.queued_direction = None 
 
@@ -66,7 +67,7 @@ class PacMan:
             if not self.is_moving and self.path:
                 if self.grid_x == self.target_grid_x and self.grid_y == self.target_grid_y: 
                     if self.path: 
-                        next_target_grid_cell = self.path.pop(0)
+                        next_target_grid_cell = self.path.popleft()
                         dx_grid = next_target_grid_cell[0] - self.grid_x
                         dy_grid = next_target_grid_cell[1] - self.grid_y
                         self.set_target_direction(dx_grid, dy_grid, current_map)
@@ -102,7 +103,7 @@ class PacMan:
         return False
 
     def draw(self, win):
-        pygame.draw.circle(win, (255, 255, 0), (int(self.pixel_x), int(self.pixel_y)), self.radius)
+        return pygame.draw.circle(win, (255, 255, 0), (int(self.pixel_x), int(self.pixel_y)), self.radius)
 
     def get_bounding_box(self):
         return pygame.Rect(self.pixel_x - self.radius, 
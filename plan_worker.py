@@ -0,0 +1,80 @@
+# plan_worker.py
+# Background planning for the safest-food search behind the auto-mode keys.
+#
+# GameSession hands the worker a snapshot of everything the search reads
+# (Pac-Man's cell, a copy of the maze, the ghost cells) and gets a future
+# back. The ghost distance field and the search both run in the worker, so a
+# slow plan never holds up a frame; the session keeps walking its last plan
+# and decides once the future is done whether the answer is still usable.
+import multiprocessing
+import sys
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from algorithms import combined_ghost_distance_map, safest_food_path
+
+def plan_safest_food(start, maze, ghost_positions, mode, food_count):
+    # The same search GameSession.find_safest_food_path runs in place;
+    # returns (path, cells expanded)
+    ghost_dist_map = combined_ghost_distance_map(ghost_positions, maze)
+    stats = {}
+    path = safest_food_path(start, maze, ghost_positions, ghost_dist_map, mode,
+                            blocked=ghost_positions, food_count=food_count, stats=stats)
+    return path, stats["expanded"]
+
+class PlanWorker:
+    # A single worker, so requests are answered in order. A process keeps the
+    # search off the GIL; it is forked because a spawned one would re-run
+    # main.py's window setup. Forking after SDL has started is only safe on
+    # Linux (macOS documents it as unsafe), so elsewhere a thread stands in.
+    def __init__(self):
+        self.restarts = 0
+        self.pool = self._new_pool()
+
+    def _new_pool(self):
+        if sys.platform.startswith("linux") and "fork" in multiprocessing.get_all_start_methods():
+            pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("fork"))
+        else:
+            pool = ThreadPoolExecutor(max_workers=1)
+        # Start the worker now rather than on the first key press
+        pool.submit(int)
+        return pool
+
+    def restart(self):
+        # Replaces a worker that died (or a pool that broke with it)
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.pool = self._new_pool()
+        self.restarts += 1
+
+    def submit(self, request):
+        try:
+            return self.pool.submit(plan_safest_food, *request)
+        except BrokenExecutor:
+            self.restart()
+            return self.pool.submit(plan_safest_food, *request)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+# --- Replays ---
+# A replayed session must take up each plan at the tick it arrived live, which
+# the replay log records. DeferredPlanner runs the search on the spot, from
+# the same snapshot the worker got, but never reports it done by itself.
+class DeferredPlan:
+    def __init__(self, plan):
+        self.plan = plan
+
+    def done(self):
+        return False
+
+    def cancel(self):
+        return False
+
+    def result(self):
+        return self.plan
+
+class DeferredPlanner:
+    def submit(self, request):
+        return DeferredPlan(plan_safest_food(*request))
+
+    def restart(self):
+        pass
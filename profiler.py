@@ -0,0 +1,122 @@
+# profiler.py
+# Per-phase frame profiler for the game loop.
+#
+# The loop calls mark(phase) at each phase boundary and the time since the
+# previous mark is charged to that phase. Searches that already time themselves
+# report through add(), and that time is taken back out of the surrounding
+# lap so nothing is counted twice. Every frame goes into a rolling window for
+# p50/p99 stats and, while recording, into a per-frame CSV trace.
+#
+# The game holds NULL_PROFILER while profiling is off: the same methods doing
+# nothing, so an unprofiled frame only pays a few empty calls.
+import csv
+import time
+from collections import deque
+
+PHASES = ("input", "pacman", "ghosts", "collision", "plan", "safest", "food",
+          "grid", "sprites", "hud", "display")
+
+class FrameProfiler:
+    enabled = True
+
+    def __init__(self, window=120):
+        self.window = window
+        self.history = {phase: deque(maxlen=window) for phase in PHASES}
+        self.history["frame"] = deque(maxlen=window)
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self.frames = 0
+        self.ticks = 0
+        self.expanded = 0       # search nodes expanded this frame
+        self.total_expanded = 0
+        self.nested = 0.0
+        self.trace = None       # rows while recording
+        self.frame_start = self.last = time.perf_counter()
+
+    # --- Per frame ---
+    def begin_frame(self):
+        self.frame_start = self.last = time.perf_counter()
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.times[phase] += now - self.last - self.nested
+        self.nested = 0.0
+        self.last = now
+
+    def add(self, phase, seconds, expanded=0):
+        # Time measured by the caller, inside the lap that is still running
+        self.times[phase] += seconds
+        self.nested += seconds
+        self.expanded += expanded
+
+    def tick(self):
+        self.ticks += 1
+
+    def end_frame(self):
+        total = time.perf_counter() - self.frame_start
+        times, history = self.times, self.history
+        for phase in PHASES:
+            history[phase].append(times[phase])
+        history["frame"].append(total)
+        if self.trace is not None:
+            self.trace.append([self.frames, total * 1000, self.ticks, self.expanded]
+                              + [times[phase] * 1000 for phase in PHASES])
+        self.frames += 1
+        self.total_expanded += self.expanded
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self.ticks = 0
+        self.expanded = 0
+        self.nested = 0.0
+
+    # --- Stats ---
+    def percentiles(self, name):
+        # (p50, p99) in milliseconds over the rolling window
+        values = sorted(self.history[name])
+        if not values:
+            return 0.0, 0.0
+        last = len(values) - 1
+        return values[last // 2] * 1000, values[last * 99 // 100] * 1000
+
+    def summary(self):
+        # [(name, p50 ms, p99 ms)] for the whole frame and each phase that
+        # took any time in the window
+        return [(name,) + self.percentiles(name) for name in ("frame",) + PHASES
+                if name == "frame" or any(self.history[name])]
+
+    # --- CSV traces ---
+    @property
+    def recording(self):
+        return self.trace is not None
+
+    def start_trace(self):
+        self.trace = []
+
+    def save_trace(self, path):
+        # Writes the frames recorded since start_trace and stops recording
+        rows, self.trace = self.trace or [], None
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "frame_ms", "ticks", "expanded"]
+                            + [f"{phase}_ms" for phase in PHASES])
+            writer.writerows(rows)
+        return len(rows)
+
+class NullProfiler:
+    enabled = False
+    recording = False
+
+    def begin_frame(self):
+        pass
+
+    def mark(self, phase):
+        pass
+
+    def add(self, phase, seconds, expanded=0):
+        pass
+
+    def tick(self):
+        pass
+
+    def end_frame(self):
+        pass
+
+NULL_PROFILER = NullProfiler()
@@ -0,0 +1,111 @@
+# replay.py
+# Compact replay logs for a level.
+#
+# A session is deterministic (see simulation.py), so a replay stores only what
+# went into it: the seed, the level settings and the (tick, code) inputs in
+# order - a few hundred bytes of JSON for a whole level. Playing it back runs
+# the level headless and checks the outcome against the recorded one.
+#
+#   python replay.py last_replay.json
+import argparse
+import json
+import time
+
+from plan_worker import DeferredPlanner
+from simulation import GameSession, POLICIES, play_session, TICK_TIMEOUT
+
+REPLAY_VERSION = 2     # 2: ghosts seeded from a sub-seed
+
+class Replay:
+    def __init__(self, seed, num_ghosts, rows, cols, ghost_chase=0.0, inputs=(), policy=None,
+                 outcome=None, background_plans=False, search_budget=None):
+        self.seed = seed
+        self.num_ghosts = num_ghosts
+        self.rows = rows
+        self.cols = cols
+        self.ghost_chase = ghost_chase
+        self.inputs = [(tick, code) for tick, code in inputs]
+        # A POLICIES name for bot runs, replayed instead of inputs
+        self.policy = policy
+        # {"result", "score", "ticks"} as recorded, or None
+        self.outcome = outcome
+        # Whether safest-food plans came from a PlanWorker, and so are taken
+        # up at their logged PLAN_CODE ticks rather than straight away
+        self.background_plans = background_plans
+        self.search_budget = search_budget
+
+    @classmethod
+    def from_session(cls, session, result=None, policy=None):
+        if session.seed is None:
+            raise ValueError("session has no seed; create it with GameSession.new_level")
+        outcome = None
+        if result is not None:
+            outcome = {"result": result, "score": session.score, "ticks": session.ticks}
+        return cls(session.seed, session.num_ghosts, session.game_map.height,
+                   session.game_map.width, session.ghost_chase, session.inputs, policy, outcome,
+                   session.planner is not None, session.search_budget)
+
+    def to_dict(self):
+        return {
+            "version": REPLAY_VERSION,
+            "seed": self.seed,
+            "num_ghosts": self.num_ghosts,
+            "rows": self.rows,
+            "cols": self.cols,
+            "ghost_chase": self.ghost_chase,
+            "policy": self.policy,
+            "outcome": self.outcome,
+            "background_plans": self.background_plans,
+            "search_budget": self.search_budget,
+            "inputs": self.inputs,
+        }
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("version") != REPLAY_VERSION:
+            raise ValueError(f"unsupported replay version {data.get('version')!r}")
+        return cls(data["seed"], data["num_ghosts"], data["rows"], data["cols"],
+                   data["ghost_chase"], data["inputs"], data["policy"], data["outcome"],
+                   data.get("background_plans", False), data.get("search_budget"))
+
+def play(replay, max_ticks=None):
+    # Plays the replay headless; returns a run_headless-style dict, with
+    # "matches" telling whether the recorded outcome (if any) was reproduced
+    if max_ticks is None:
+        max_ticks = replay.outcome["ticks"] if replay.outcome else 100000
+    session = GameSession.new_level(replay.num_ghosts, replay.rows, replay.cols, replay.seed,
+                                    replay.ghost_chase)
+    if replay.background_plans:
+        session.planner = DeferredPlanner()
+    session.search_budget = replay.search_budget
+    policy = POLICIES[replay.policy]() if replay.policy else None
+
+    started = time.perf_counter()
+    result = play_session(session, max_ticks, policy, replay.inputs)
+    outcome = {"result": result, "score": session.score, "ticks": session.ticks}
+    return dict(outcome,
+                seed=replay.seed,
+                policy=replay.policy or "inputs",
+                seconds=time.perf_counter() - started,
+                matches=replay.outcome is None or outcome == replay.outcome)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play back a saved replay headless.")
+    parser.add_argument("path")
+    parser.add_argument("--max-ticks", type=int, default=None)
+    args = parser.parse_args()
+
+    replay = Replay.load(args.path)
+    run = play(replay, args.max_ticks)
+    print(f"seed {run['seed']} {run['policy']}: {run['result']} score {run['score']} "
+          f"{run['ticks']} ticks ({len(replay.inputs)} inputs)")
+    if replay.outcome is not None:
+        print("matches recording" if run["matches"] else f"DIFFERS from recording {replay.outcome}")
+    if run["result"] == TICK_TIMEOUT and replay.outcome is None:
+        print("no recorded outcome; stopped at the tick limit")
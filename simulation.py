@@ -0,0 +1,462 @@
+# simulation.py
+# Game rules without any display: the per-tick update shared by the windowed
+# game loop in main.py and the headless fast-forward runner below.
+#
+# A session is deterministic: the maze comes from its seed and every other
+# random choice (ghost spawns and moves) from a random.Random owned by the
+# session, seeded from a sub-seed so its stream is independent of the one
+# generate_maze carved the maze with. Given the same seed and the same inputs
+# at the same ticks, a level plays out the same way at any frame rate;
+# replay.py builds on that.
+import random
+import time
+from collections import deque
+
+from algorithms import (bfs, dfs, astar, jps, manhattan, safest_food_path,
+                        combined_ghost_distance_map, SlicedSearch, SEARCH_MODES)
+from corridors import CorridorGraph
+from dstar_lite import DStarLite
+from ghost import GhostSwarm, GHOST_COLORS, get_ghost_spawn_points
+from grid import ROWS, COLS
+from maze import as_maze, CellOverlay, MazeIndex
+from maze_generator import generate_maze
+from pacman import PacMan
+from profiler import NULL_PROFILER
+
+# --- Tick results ---
+TICK_PLAYING = "playing"
+TICK_WIN = "win"
+TICK_LOSE = "lose"
+TICK_TIMEOUT = "timeout"
+
+# Modes that plan a path to the nearest food on their own
+AUTO_MODES = ("bfs", "dfs", "graph", "astar", "jps", "dstar")
+# Goal-directed modes: they head for one chosen pellet instead of searching
+# outwards for whichever is nearest
+GOAL_SEARCHES = {"astar": astar, "jps": jps}
+
+# Replay log codes for steer() directions; auto modes are logged by name
+STEER_CODES = {(-1, 0): "L", (1, 0): "R", (0, -1): "U", (0, 1): "D"}
+STEER_DIRECTIONS = {code: delta for delta, code in STEER_CODES.items()}
+# Replay log codes for a background plan being taken up, or lost because
+# the worker failed
+PLAN_CODE = "plan"
+PLAN_LOST_CODE = "plan-lost"
+
+class GameSession:
+    def __init__(self, game_map, start_pos, num_ghosts, ghost_chase=0.0, seed=None):
+        game_map = as_maze(game_map)
+        self.game_map = game_map
+        self.start_pos = start_pos
+        self.num_ghosts = num_ghosts
+        self.ghost_chase = ghost_chase
+        self.seed = seed
+        self.rng = random.Random(None if seed is None else f"ghosts-{seed}")
+
+        # Ensure the start position is not a food tile
+        start_x, start_y = start_pos
+        if game_map[start_y][start_x] == 2:
+            game_map[start_y][start_x] = 0
+        self.index = MazeIndex(game_map)
+        # Ghost distance field, reused while the ghosts stay on the same cells
+        self.ghost_field_key = None
+        self.ghost_field = None
+        self.ghost_field_hits = 0
+        self.ghost_field_misses = 0
+        # Junction graph for the "graph" mode and incremental planner for the
+        # "dstar" mode, each built the first time it is used
+        self.corridors = None
+        self.incremental = None
+
+        self.pacman = PacMan(start_pos)
+        ghost_spawn_positions = get_ghost_spawn_points(game_map, num_ghosts, start_pos,
+                                                       spawn_candidates=self.index.empty_cells,
+                                                       rng=self.rng)
+        # Chasing ghosts keep their own cache of fields rooted at Pac-Man
+        self.ghosts = GhostSwarm(ghost_spawn_positions[:num_ghosts], GHOST_COLORS,
+                                 chase=ghost_chase, rng=self.rng)
+        # Ghost cells as extra walls for planning, kept in step with the ghosts
+        self.ghost_overlay = CellOverlay(game_map.width, ghost_spawn_positions[:num_ghosts])
+
+        self.mode = "manual"
+        self.score = 0
+        self.visited_path_nodes = set()
+        self.targeted_food_coord = None
+        self.last_eaten_food = None
+
+        # Ticks played so far, and (tick, code) for every input, in order
+        self.ticks = 0
+        self.inputs = []
+
+        # Time spent inside bfs/dfs/safest-food planning, for tuning
+        self.plans = 0
+        self.planning_seconds = 0.0
+        # Per-phase frame timings; main.py swaps in a FrameProfiler when asked
+        self.profiler = NULL_PROFILER
+
+        # Safest-food plans run in place, or on this PlanWorker when set; the
+        # future of the plan still outstanding, and the food count it saw
+        self.planner = None
+        self.pending_plan = None
+        self.pending_food_count = None
+
+        # Cells a bfs/dfs replan may expand per tick; bigger searches carry on
+        # over the next ticks as a SlicedSearch while Pac-Man walks its old
+        # path. None finishes every search in the tick it starts.
+        self.search_budget = None
+        self.search = None
+        self.search_frontier = set()    # cells it has queued, drawn while it runs
+
+    @classmethod
+    def new_level(cls, num_ghosts, rows=ROWS, cols=COLS, seed=None, ghost_chase=0.0):
+        # Without a seed one is drawn, so every level can be replayed
+        if seed is None:
+            seed = random.randrange(2**32)
+        game_map, start_pos = generate_maze(rows, cols, seed)
+        return cls(game_map, start_pos, num_ghosts, ghost_chase, seed)
+
+    def pacman_grid_pos(self):
+        return self.pacman.grid_x, self.pacman.grid_y
+
+    def follow_path(self, path_full):
+        if path_full:
+            self.pacman.path = deque(path_full[1:])
+            self.targeted_food_coord = path_full[-1]
+        else:
+            self.pacman.path = deque()
+            self.targeted_food_coord = None
+
+    # --- Player input ---
+    def steer(self, dx, dy):
+        self.inputs.append((self.ticks, STEER_CODES[dx, dy]))
+        self.cancel_plan()
+        self.search = None
+        self.search_frontier = set()
+        self.mode = "manual"
+        self.pacman.path = deque()
+        self.targeted_food_coord = None
+        self.pacman.set_target_direction(dx, dy, self.game_map)
+
+    def start_auto_mode(self, mode):
+        # Q / E / G / Z / J / I: switch to bfs / dfs / graph / astar / jps /
+        # dstar and head for the safest food first; the modes without a search
+        # order of their own pick it in bfs order
+        self.inputs.append((self.ticks, mode))
+        self.mode = mode
+        self.search = None
+        self.search_frontier = set()
+        search_mode = mode if mode in SEARCH_MODES else "bfs"
+        if self.planner is None:
+            self.pacman.path = deque()
+            self.follow_path(self.find_safest_food_path(search_mode))
+            return
+        # Pac-Man keeps walking its last plan until the worker answers
+        self.cancel_plan()
+        self.pending_plan = self.planner.submit(self.safest_food_request(search_mode))
+        self.pending_food_count = self.index.food_count
+
+    # --- Background planning ---
+    def safest_food_request(self, mode):
+        # Snapshot for the worker; the maze is copied so later changes can't
+        # leak into a search that is still running
+        return (self.pacman_grid_pos(), self.game_map.copy(), self.ghosts.positions(), mode,
+                self.index.food_count)
+
+    def cancel_plan(self):
+        if self.pending_plan is not None:
+            self.pending_plan.cancel()
+            self.pending_plan = None
+
+    def receive_plan(self):
+        # Takes up the finished background plan, unless food was eaten since
+        # it was asked for or Pac-Man has walked off it in the meantime
+        future, self.pending_plan = self.pending_plan, None
+        try:
+            path_full, expanded = future.result()
+        except Exception:
+            # The worker died or the search raised: the plan is dropped, so
+            # the auto-mode replan takes over, and the worker is replaced
+            self.inputs.append((self.ticks, PLAN_LOST_CODE))
+            self.planner.restart()
+            return
+        self.inputs.append((self.ticks, PLAN_CODE))
+        # Searched off the frame: only the expansions count here
+        self.profiler.add("safest", 0.0, expanded)
+        if self.index.food_count != self.pending_food_count:
+            return
+        pos = self.pacman_grid_pos()
+        if path_full and pos not in path_full:
+            return
+        self.follow_path(path_full[path_full.index(pos):] if path_full else path_full)
+
+    def corridor_graph(self):
+        if self.corridors is None:
+            self.corridors = CorridorGraph(self.game_map)
+        return self.corridors
+
+    def incremental_planner(self):
+        # Reads the ghost overlay itself, so it only has to be told about food
+        if self.incremental is None:
+            self.incremental = DStarLite(self.game_map, self.ghost_overlay)
+        return self.incremental
+
+    def find_safest_food_path(self, mode=None):
+        started = time.perf_counter()
+        ghost_positions = self.ghosts.positions()
+        ghost_dist_map = self.ghost_distance_field(ghost_positions)
+        stats = {}
+        path = safest_food_path(self.pacman_grid_pos(), self.game_map, ghost_positions,
+                                ghost_dist_map, mode or self.mode, blocked=self.ghost_overlay,
+                                food_count=self.index.food_count, stats=stats)
+        elapsed = time.perf_counter() - started
+        self.plans += 1
+        self.planning_seconds += elapsed
+        self.profiler.add("safest", elapsed, stats["expanded"])
+        return path
+
+    def ghost_distance_field(self, ghost_positions):
+        # One multi-source BFS over the whole pack, so the cost does not grow
+        # with the ghost count; kept until a ghost changes cell
+        key = frozenset(ghost_positions)
+        if key == self.ghost_field_key:
+            self.ghost_field_hits += 1
+            return self.ghost_field
+        self.ghost_field_misses += 1
+        self.ghost_field = combined_ghost_distance_map(ghost_positions, self.game_map)
+        self.ghost_field_key = key
+        return self.ghost_field
+
+    def goal_food(self):
+        # Keeps the pellet already being chased until it is eaten or found cut
+        # off, so the O(food) pick below runs about once per pellet; the new
+        # goal is the one closest as the crow flies (Manhattan), which is what
+        # the heuristic searches aim for
+        food = self.index.food
+        if self.targeted_food_coord in food:
+            return self.targeted_food_coord
+        pos = self.pacman_grid_pos()
+        return min(food, key=lambda cell: manhattan(pos, cell), default=None)
+
+    def replan(self):
+        started = time.perf_counter()
+        expanded = None     # cells expanded, when not just len(visited_cells)
+        # Ghost cells are blocked through the overlay, the map is never copied
+        if self.mode == "graph":
+            path_full, visited_cells = self.corridor_graph().nearest_food(
+                self.pacman_grid_pos(), blocked=self.ghost_overlay)
+        elif self.mode == "dstar":
+            path_full, visited_cells = self.incremental_planner().plan(self.pacman_grid_pos())
+        elif self.mode in GOAL_SEARCHES:
+            goal = self.goal_food()
+            path_full, visited_cells = [], ()
+            if goal is not None:
+                path_full, visited_cells = GOAL_SEARCHES[self.mode](
+                    self.pacman_grid_pos(), goal, self.game_map, blocked=self.ghost_overlay)
+            if goal is not None and not path_full:
+                # The goal is cut off (a ghost in the way): head for the nearest
+                # pellet bfs can reach, which goal_food then keeps as the goal
+                cells, width = self.game_map.cells, self.game_map.width
+                path_full, fallback_visited = bfs(self.pacman_grid_pos(),
+                                                  lambda x, y: cells[y * width + x] == 2,
+                                                  self.game_map, blocked=self.ghost_overlay)
+                visited_cells = set(visited_cells) | fallback_visited
+        elif self.search_budget is not None:
+            expanded_before = self.search.expanded if self.search is not None else 0
+            finished = self.step_search()
+            expanded = self.search.expanded - expanded_before
+            if not finished:
+                elapsed = time.perf_counter() - started
+                self.planning_seconds += elapsed
+                self.profiler.add("plan", elapsed, expanded)
+                return
+            path_full, visited_cells = self.search.path, self.search.visited
+            self.search = None
+            self.search_frontier = set()
+        else:
+            cells, width = self.game_map.cells, self.game_map.width
+            algo_func = bfs if self.mode == "bfs" else dfs
+            path_full, visited_cells = algo_func(
+                self.pacman_grid_pos(),
+                lambda x, y: cells[y * width + x] == 2,
+                self.game_map,
+                blocked=self.ghost_overlay
+            )
+
+        self.visited_path_nodes.clear()
+        self.visited_path_nodes.update(visited_cells)
+        self.follow_path(path_full)
+        elapsed = time.perf_counter() - started
+        self.plans += 1
+        self.planning_seconds += elapsed
+        self.profiler.add("plan", elapsed, len(visited_cells) if expanded is None else expanded)
+
+    def step_search(self):
+        # Runs the bfs/dfs replan for up to search_budget cells; returns True
+        # once self.search holds a finished path from Pac-Man's current cell
+        if self.search is None:
+            cells, width = self.game_map.cells, self.game_map.width
+            self.search = SlicedSearch(self.pacman_grid_pos(),
+                                       lambda x, y: cells[y * width + x] == 2,
+                                       self.game_map, self.mode, blocked=self.ghost_overlay)
+        search = self.search
+        if not search.step(self.search_budget):
+            # Show the search so far; Pac-Man keeps to its previous path
+            self.visited_path_nodes.clear()
+            self.visited_path_nodes.update(search.visited)
+            self.search_frontier = search.frontier_cells()
+            return False
+        # Pac-Man may have moved on since the search started
+        pos = self.pacman_grid_pos()
+        if search.path and pos in search.path:
+            search.path = search.path[search.path.index(pos):]
+        elif search.path:
+            search.path = []
+        return True
+
+    # --- One game tick ---
+    def tick(self):
+        if self.pending_plan is not None and self.pending_plan.done():
+            self.receive_plan()
+        self.ticks += 1
+        self.last_eaten_food = None
+        profiler = self.profiler
+        profiler.tick()
+        pacman = self.pacman
+        pacman_reached_cell = pacman.update(self.game_map)
+        profiler.mark("pacman")
+        ghosts = self.ghosts
+        for i, old_pos in ghosts.update(self.game_map, (pacman.grid_x, pacman.grid_y)):
+            self.ghost_overlay.move(old_pos, ghosts.get_grid_position(i))
+        profiler.mark("ghosts")
+
+        # Check collision with ghosts near Pac-Man's cell
+        hit = ghosts.touches((pacman.grid_x, pacman.grid_y), pacman.pixel_x, pacman.pixel_y,
+                             pacman.radius)
+        profiler.mark("collision")
+        if hit:
+            self.targeted_food_coord = None
+            return TICK_LOSE
+
+        # Recalculate BFS/DFS path when Pac-Man reaches a new cell or path is
+        # empty, unless a background plan is still on its way
+        if (self.mode in AUTO_MODES and self.pending_plan is None
+                and (not pacman.path or pacman_reached_cell or self.search is not None)):
+            self.replan()
+
+        # Eating food and scoring
+        result = TICK_PLAYING
+        if pacman_reached_cell:
+            cx, cy = pacman.grid_x, pacman.grid_y
+            if self.index.eat(cx, cy):
+                self.last_eaten_food = (cx, cy)
+                if self.corridors is not None:
+                    self.corridors.eat(cx, cy)
+                if self.incremental is not None:
+                    self.incremental.eat(cx, cy)
+                self.score += 10
+                if self.targeted_food_coord == (cx, cy):
+                    self.targeted_food_coord = None
+
+                # Check win condition
+                if not self.index.food_left():
+                    result = TICK_WIN
+        profiler.mark("food")
+        return result
+
+# --- Headless fast-forward runs ---
+# A policy is called once per tick, before the update, as policy(session, tick)
+# and drives the session through the same input methods the key handlers use.
+def auto_policy(mode):
+    # Same as pressing Q (bfs) or E (dfs) at the first tick
+    def policy(session, tick):
+        if tick == 0:
+            session.start_auto_mode(mode)
+    return policy
+
+def safest_food_policy(mode):
+    # Stays in manual mode and walks find_safest_food_path plans end to end,
+    # asking for a new one whenever the previous plan has been used up
+    def policy(session, tick):
+        if not session.pacman.path and not session.pacman.is_moving:
+            session.follow_path(session.find_safest_food_path(mode))
+    return policy
+
+# Policies by name, so they can be picked from the command line or sent to
+# worker processes
+POLICIES = {
+    "bfs": lambda: auto_policy("bfs"),
+    "dfs": lambda: auto_policy("dfs"),
+    "graph": lambda: auto_policy("graph"),
+    "astar": lambda: auto_policy("astar"),
+    "jps": lambda: auto_policy("jps"),
+    "dstar": lambda: auto_policy("dstar"),
+    "safest-bfs": lambda: safest_food_policy("bfs"),
+    "safest-dfs": lambda: safest_food_policy("dfs"),
+}
+
+def apply_input(session, code):
+    # Plays one replay log code: a STEER_CODES letter, PLAN_CODE,
+    # PLAN_LOST_CODE or an auto mode name
+    if code in STEER_DIRECTIONS:
+        session.steer(*STEER_DIRECTIONS[code])
+    elif code == PLAN_CODE:
+        session.receive_plan()
+    elif code == PLAN_LOST_CODE:
+        session.cancel_plan()
+    else:
+        session.start_auto_mode(code)
+
+def play_session(session, max_ticks, policy=None, inputs=()):
+    # Ticks the session until the level ends or max_ticks have been played.
+    # Before each tick, logged (tick, code) inputs due by then are applied and
+    # then policy(session, tick) is called. Returns the final TICK_* result.
+    pending = deque(inputs)
+    while session.ticks < max_ticks:
+        tick = session.ticks
+        while pending and pending[0][0] <= tick:
+            apply_input(session, pending.popleft()[1])
+        if policy is not None:
+            policy(session, tick)
+        status = session.tick()
+        if status != TICK_PLAYING:
+            return status
+    return TICK_TIMEOUT
+
+# maze is an optional (game_map, start_pos), e.g. from a MazeCorpus, played
+# instead of generating the maze from seed; seed still drives the ghosts
+def run_headless(seed, policy="bfs", num_ghosts=5, rows=ROWS, cols=COLS, max_ticks=100000,
+                 ghost_chase=0.0, maze=None):
+    policy_name = policy if isinstance(policy, str) else getattr(policy, "__name__", "custom")
+    if isinstance(policy, str):
+        policy = POLICIES[policy]()
+
+    if maze is None:
+        session = GameSession.new_level(num_ghosts, rows, cols, seed, ghost_chase)
+    else:
+        session = GameSession(maze[0], maze[1], num_ghosts, ghost_chase, seed)
+
+    started = time.perf_counter()
+    result = play_session(session, max_ticks, policy)
+    ticks = session.ticks
+
+    return {
+        "seed": seed,
+        "policy": policy_name,
+        "num_ghosts": num_ghosts,
+        "ghost_chase": ghost_chase,
+        "result": result,
+        "score": session.score,
+        "ticks": ticks,
+        "seconds": time.perf_counter() - started,
+        "plans": session.plans,
+        "planning_seconds": session.planning_seconds,
+        "distance_hits": session.ghost_field_hits,
+        "distance_misses": session.ghost_field_misses,
+    }
+
+if __name__ == "__main__":
+    for seed in range(5):
+        for policy_name in POLICIES:
+            run = run_headless(seed, policy_name)
+            print(f"seed {seed} {policy_name:<10}: {run['result']:<7} score {run['score']:>4}  "
+                  f"{run['ticks']:>5} ticks  {run['ticks'] / run['seconds']:8.0f} ticks/s")
@@ -0,0 +1,26 @@
+from algorithms import bfs
+from corridors import CorridorGraph
+from maze import CellOverlay, Maze
+
+MAZE = [
+    [1, 1, 1, 1, 1, 1, 1],
+    [1, 0, 0, 0, 0, 2, 1],
+    [1, 1, 1, 0, 1, 1, 1],
+    [1, 1, 1, 0, 1, 1, 1],
+    [1, 1, 1, 1, 1, 1, 1],
+]
+
+def nearest_food_both_ways(start):
+    maze = Maze.from_rows(MAZE)
+    ghosts = CellOverlay(maze.width, [start])
+    path, _ = CorridorGraph(maze).nearest_food(start, blocked=ghosts)
+    expected, _ = bfs(start, lambda x, y: maze.get(x, y) == 2, maze, blocked=ghosts)
+    return path, expected
+
+def test_ghost_on_start_junction_does_not_block():
+    path, expected = nearest_food_both_ways((3, 1))
+    assert path == expected == [(3, 1), (4, 1), (5, 1)]
+
+def test_ghost_on_start_corridor_cell_does_not_block():
+    path, expected = nearest_food_both_ways((2, 1))
+    assert path == expected == [(2, 1), (3, 1), (4, 1), (5, 1)]
@@ -0,0 +1,32 @@
+from algorithms import bfs
+from dstar_lite import DStarLite
+from maze import CellOverlay, Maze
+
+MAZE = [
+    [1, 1, 1, 1, 1, 1],
+    [1, 0, 0, 0, 2, 1],
+    [1, 0, 1, 1, 0, 1],
+    [1, 0, 0, 0, 0, 1],
+    [1, 1, 1, 1, 1, 1],
+]
+
+def is_food(maze):
+    return lambda x, y: maze.get(x, y) == 2
+
+def test_ghost_on_start_cell_does_not_block():
+    maze = Maze.from_rows(MAZE)
+    ghosts = CellOverlay(maze.width, [(1, 1)])
+    path, _ = DStarLite(maze, ghosts).plan((1, 1))
+    expected, _ = bfs((1, 1), is_food(maze), maze, blocked=ghosts)
+    assert path == expected == [(1, 1), (2, 1), (3, 1), (4, 1)]
+
+def test_ghost_moving_onto_start_cell_between_plans():
+    maze = Maze.from_rows(MAZE)
+    ghosts = CellOverlay(maze.width, [(1, 3)])
+    planner = DStarLite(maze, ghosts)
+    assert planner.plan((1, 1))[0] == [(1, 1), (2, 1), (3, 1), (4, 1)]
+    ghosts.move((1, 3), (1, 1))
+    assert planner.plan((1, 1))[0] == [(1, 1), (2, 1), (3, 1), (4, 1)]
+    # Once Pac-Man has left, the ghost's cell blocks it again
+    path, _ = planner.plan((1, 2))
+    assert path == [(1, 2), (1, 3), (2, 3), (3, 3), (4, 3), (4, 2), (4, 1)]
@@ -0,0 +1,134 @@
+# tournament.py
+# Runs seeded headless episodes for several auto-play policies and ghost
+# counts on a process pool, streaming each result as it finishes.
+#
+#   python tournament.py --episodes 1000 --ghosts 5 6 7 --base-seed 42
+#   python tournament.py --corpus corpus.pmz        # fixed mazes, see maze_corpus.py
+import argparse
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from maze_corpus import MazeCorpus
+from simulation import run_headless, POLICIES, TICK_WIN
+
+def episode_seeds(base_seed, episodes):
+    # Every (policy, ghost count) pair plays the same mazes, and the whole
+    # tournament is reproducible from base_seed alone
+    rng = random.Random(base_seed)
+    return [rng.randrange(2**32) for _ in range(episodes)]
+
+def corpus_seeds(path, episodes):
+    # (seed, maze number) for the first `episodes` mazes of a corpus; mazes
+    # stored without a seed use their number
+    with MazeCorpus(path) as corpus:
+        return [(corpus.seed(k) if corpus.seed(k) is not None else k, k)
+                for k in range(min(episodes, len(corpus)))]
+
+# Corpora opened so far in this worker process, by path
+_corpora = {}
+
+def _run_episode(job):
+    seed, policy_name, num_ghosts, max_ticks, ghost_chase, corpus_path, maze_number = job
+    maze = None
+    if corpus_path is not None:
+        if corpus_path not in _corpora:
+            _corpora[corpus_path] = MazeCorpus(corpus_path)
+        maze = _corpora[corpus_path].load(maze_number)
+    return run_headless(seed, policy_name, num_ghosts, max_ticks=max_ticks, ghost_chase=ghost_chase,
+                        maze=maze)
+
+def run_tournament(policies, ghost_counts, episodes, base_seed=0, max_ticks=20000, workers=None,
+                   ghost_chase=0.0, corpus=None):
+    # Generator: yields each episode result dict as soon as a worker finishes it.
+    # With a corpus path the episodes play its mazes instead of generated ones.
+    if corpus is None:
+        episode_mazes = [(seed, None) for seed in episode_seeds(base_seed, episodes)]
+    else:
+        episode_mazes = corpus_seeds(corpus, episodes)
+    jobs = [(seed, policy_name, num_ghosts, max_ticks, ghost_chase, corpus, maze_number)
+            for seed, maze_number in episode_mazes
+            for policy_name in policies
+            for num_ghosts in ghost_counts]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_run_episode, job) for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+
+class TournamentStats:
+    def __init__(self):
+        self.groups = {}
+
+    def add(self, run):
+        key = (run["policy"], run["num_ghosts"])
+        group = self.groups.setdefault(key, {
+            "episodes": 0, "wins": 0, "score": 0, "ticks": 0,
+            "plans": 0, "planning_seconds": 0.0,
+            "distance_hits": 0, "distance_misses": 0,
+        })
+        group["episodes"] += 1
+        group["wins"] += run["result"] == TICK_WIN
+        group["score"] += run["score"]
+        group["ticks"] += run["ticks"]
+        group["plans"] += run["plans"]
+        group["planning_seconds"] += run["planning_seconds"]
+        group["distance_hits"] += run["distance_hits"]
+        group["distance_misses"] += run["distance_misses"]
+
+    def rows(self):
+        for (policy_name, num_ghosts), group in sorted(self.groups.items()):
+            n = group["episodes"]
+            yield {
+                "policy": policy_name,
+                "num_ghosts": num_ghosts,
+                "episodes": n,
+                "win_rate": group["wins"] / n,
+                "mean_score": group["score"] / n,
+                "mean_ticks": group["ticks"] / n,
+                "planning_us_per_tick": group["planning_seconds"] / max(group["ticks"], 1) * 1e6,
+                "planning_us_per_plan": group["planning_seconds"] / max(group["plans"], 1) * 1e6,
+                "distance_hit_rate": group["distance_hits"] /
+                                     max(group["distance_hits"] + group["distance_misses"], 1),
+            }
+
+    def print_table(self):
+        print(f"{'policy':<11} {'ghosts':>6} {'episodes':>8} {'win %':>6} {'score':>8} "
+              f"{'ticks':>8} {'plan us/tick':>12} {'us/plan':>9} {'dist hit %':>10}")
+        for row in self.rows():
+            print(f"{row['policy']:<11} {row['num_ghosts']:>6} {row['episodes']:>8} "
+                  f"{row['win_rate'] * 100:6.1f} {row['mean_score']:8.1f} {row['mean_ticks']:8.1f} "
+                  f"{row['planning_us_per_tick']:12.1f} {row['planning_us_per_plan']:9.1f} "
+                  f"{row['distance_hit_rate'] * 100:10.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless auto-play tournament")
+    parser.add_argument("--policies", nargs="+", default=list(POLICIES), choices=list(POLICIES))
+    parser.add_argument("--ghosts", nargs="+", type=int, default=[5])
+    parser.add_argument("--episodes", type=int, default=100)
+    parser.add_argument("--base-seed", type=int, default=0)
+    parser.add_argument("--max-ticks", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chase", type=float, default=0.0,
+                        help="chance a ghost at a fork heads for Pac-Man (0 = wander)")
+    parser.add_argument("--corpus", default=None,
+                        help="play the mazes of this maze_corpus.py file instead of generated ones")
+    parser.add_argument("--quiet", action="store_true", help="don't print each episode as it finishes")
+    args = parser.parse_args()
+
+    stats = TournamentStats()
+    episodes = args.episodes
+    if args.corpus is not None:
+        with MazeCorpus(args.corpus) as corpus:
+            episodes = min(episodes, len(corpus))
+    total = episodes * len(args.policies) * len(args.ghosts)
+    for done, run in enumerate(run_tournament(args.policies, args.ghosts, args.episodes,
+                                              args.base_seed, args.max_ticks, args.workers,
+                                              args.chase, args.corpus), 1):
+        stats.add(run)
+        if not args.quiet:
+            print(f"[{done}/{total}] seed {run['seed']} {run['policy']} ghosts {run['num_ghosts']}: "
+                  f"{run['result']} score {run['score']} ticks {run['ticks']}")
+    stats.print_table()
+
+if __name__ == "__main__":
+    main()